@@ -6,7 +6,7 @@ from fastapi import FastAPI
 
 from streaming_providers.models import BaseMessage
 from streaming_providers.pipecat.pipecat import PipecatStreamingConfig
-from telephony.config_manager.redis_config_manager import RedisConfigManager
+from telephony.config_manager.cached_redis_config_manager import CachedRedisConfigManager
 from telephony.models.telephony import TwilioConfig
 from telephony.server.server import TelephonyServer, TwilioInboundCallConfig
 
@@ -24,7 +24,7 @@ if not BASE_URL:
 
 telephony_server = TelephonyServer(
     base_url=BASE_URL,
-    config_manager=RedisConfigManager(),
+    config_manager=CachedRedisConfigManager(),
     inbound_call_configs=[
         TwilioInboundCallConfig(
             url="/twilio/inbound_call",
@@ -0,0 +1,86 @@
+import asyncio
+import os
+import time
+
+from telephony.server.admission import AdmissionController, AdmissionLimits
+from telephony.utils.latency import LatencyHistogram
+
+FRAME_SECONDS = 0.02
+# event loop time each simulated call spends per 20ms frame
+CPU_PER_FRAME_MS = float(os.environ.get("BENCH_CPU_PER_FRAME_MS", 0.5))
+CALL_SECONDS = float(os.environ.get("BENCH_CALL_SECONDS", 3))
+OFFERED_CALLS = [10, 30, 60, 120]
+
+
+def burn(ms: float):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+async def simulated_call(lateness: LatencyHistogram):
+    # sends a frame every 20ms like the audio pacer, recording how late each
+    # one goes out
+    start = time.monotonic()
+    for frame in range(int(CALL_SECONDS / FRAME_SECONDS)):
+        due = start + frame * FRAME_SECONDS
+        delay = due - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        lateness.record(max(0.0, time.monotonic() - due) * 1000)
+        burn(CPU_PER_FRAME_MS)
+
+
+async def run(offered: int, controller: AdmissionController | None) -> str:
+    lateness = LatencyHistogram()
+    calls = []
+    refused = 0
+    for i in range(offered):
+        # calls arrive over the first second
+        await asyncio.sleep(1 / offered)
+        if controller is not None and not controller.admit_call(f"call-{i}"):
+            refused += 1
+            continue
+
+        async def call():
+            if controller is None:
+                await simulated_call(lateness)
+                return
+            with controller.track_call():
+                await simulated_call(lateness)
+
+        calls.append(asyncio.create_task(call()))
+    await asyncio.gather(*calls)
+    summary = lateness.summary()
+    return (
+        f"admitted {offered - refused:>4}  late p50 {summary['p50']:>7.1f} ms"
+        f"  p99 {summary['p99']:>7.1f} ms"
+    )
+
+
+async def main():
+    saturation = int(FRAME_SECONDS * 1000 / CPU_PER_FRAME_MS)
+    print(f"saturation at ~{saturation} calls ({CPU_PER_FRAME_MS} ms per frame)")
+    policies = {
+        "no admission": None,
+        "call limit": AdmissionLimits(
+            max_active_calls=int(saturation * 0.8), max_loop_lag_ms=1000, max_cpu=1.0
+        ),
+        "loop lag": AdmissionLimits(
+            max_active_calls=1000, max_loop_lag_ms=10, max_cpu=1.0
+        ),
+    }
+    for offered in OFFERED_CALLS:
+        for name, limits in policies.items():
+            controller = None
+            if limits is not None:
+                controller = AdmissionController(limits)
+                controller.start()
+            result = await run(offered, controller)
+            if controller is not None:
+                await controller.stop()
+            print(f"{offered:>4} offered  {name:<13} {result}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
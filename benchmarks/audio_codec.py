@@ -0,0 +1,50 @@
+import os
+import time
+
+import numpy as np
+from pipecat.audio.utils import pcm_to_ulaw, ulaw_to_pcm
+
+from telephony.utils.audio_codec import UlawDecoder, UlawEncoder
+
+TWILIO_SAMPLE_RATE = 8000
+PIPELINE_SAMPLE_RATE = 16000
+TTS_SAMPLE_RATE = 24000
+NUM_FRAMES = int(os.environ.get("BENCH_FRAMES", 20_000))
+
+
+def frames_per_second(fn, frames) -> float:
+    start = time.perf_counter()
+    for frame in frames:
+        fn(frame)
+    return len(frames) / (time.perf_counter() - start)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    # 20 ms of audio in each direction
+    inbound = [rng.integers(0, 256, 160, dtype=np.uint8).tobytes() for _ in range(64)]
+    outbound = [
+        rng.integers(-8000, 8000, 480, dtype=np.int16).tobytes() for _ in range(64)
+    ]
+    inbound = (inbound * (NUM_FRAMES // len(inbound) + 1))[:NUM_FRAMES]
+    outbound = (outbound * (NUM_FRAMES // len(outbound) + 1))[:NUM_FRAMES]
+
+    decoder = UlawDecoder(TWILIO_SAMPLE_RATE, PIPELINE_SAMPLE_RATE)
+    encoder = UlawEncoder(TTS_SAMPLE_RATE, TWILIO_SAMPLE_RATE)
+
+    results = {
+        "inbound pipecat": frames_per_second(
+            lambda f: ulaw_to_pcm(f, TWILIO_SAMPLE_RATE, PIPELINE_SAMPLE_RATE), inbound
+        ),
+        "inbound codec": frames_per_second(decoder.decode, inbound),
+        "outbound pipecat": frames_per_second(
+            lambda f: pcm_to_ulaw(f, TTS_SAMPLE_RATE, TWILIO_SAMPLE_RATE), outbound
+        ),
+        "outbound codec": frames_per_second(encoder.encode, outbound),
+    }
+    for name, fps in results.items():
+        print(f"{name:<18} {fps:>12,.0f} frames/s  ({fps / 50:,.0f} realtime calls)")
+
+
+if __name__ == "__main__":
+    main()
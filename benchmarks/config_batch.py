@@ -0,0 +1,58 @@
+import asyncio
+import os
+import time
+
+from benchmarks.config_encoding import make_config, system_prompt
+from telephony.config_manager.redis_config_manager import RedisConfigManager
+
+BATCH_SIZES = [1, 10, 100, 1000]
+CONFIGS_PER_RUN = int(os.environ.get("BENCH_CONFIGS", 2000))
+
+
+async def configs_per_second(run, batches) -> float:
+    start = time.perf_counter()
+    for batch in batches:
+        await run(batch)
+    return CONFIGS_PER_RUN / (time.perf_counter() - start)
+
+
+async def run_benchmark():
+    # against the Redis from REDISHOST/REDISPORT, localhost:6379 by default
+    config_manager = RedisConfigManager()
+    config = make_config(system_prompt)
+    ids = [f"bench_config_{i}" for i in range(CONFIGS_PER_RUN)]
+
+    async def save_one_by_one(batch):
+        for conversation_id in batch:
+            await config_manager.save_config(conversation_id, config)
+
+    async def get_one_by_one(batch):
+        for conversation_id in batch:
+            await config_manager.get_config(conversation_id)
+
+    print(f"{'batch':>6} {'save/s':>9} {'get/s':>9} {'delete/s':>9}")
+    for batch_size in BATCH_SIZES:
+        batches = [ids[i : i + batch_size] for i in range(0, len(ids), batch_size)]
+        if batch_size == 1:
+            save = await configs_per_second(save_one_by_one, batches)
+            get = await configs_per_second(get_one_by_one, batches)
+        else:
+            save = await configs_per_second(
+                lambda batch: config_manager.save_configs(dict.fromkeys(batch, config)),
+                batches,
+            )
+            get = await configs_per_second(config_manager.get_configs, batches)
+        delete = await configs_per_second(config_manager.delete_configs, batches)
+        print(f"{batch_size:>6} {save:>9.0f} {get:>9.0f} {delete:>9.0f}")
+    await config_manager.redis.aclose()
+
+
+def main():
+    from loguru import logger
+
+    logger.remove()
+    asyncio.run(run_benchmark())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import os
+import time
+
+from streaming_providers.models import BaseMessage
+from streaming_providers.pipecat.pipecat import PipecatStreamingConfig
+from telephony.config_manager.encoding import (
+    decode_config,
+    encode_config,
+    provider_config_hash,
+)
+from telephony.models.telephony import BaseCallConfig, TwilioCallConfig, TwilioConfig
+
+os.environ.setdefault("BASE_URL", "example.com")
+from apps.telephony_app.outbound_call import system_prompt  # noqa: E402
+
+ITERATIONS = int(os.environ.get("BENCH_ITERATIONS", 2000))
+
+
+def make_config(prompt: str) -> TwilioCallConfig:
+    return TwilioCallConfig(
+        twilio_config=TwilioConfig(account_sid="AC" + "0" * 32, auth_token="0" * 32),
+        twilio_sid="CA" + "0" * 32,
+        from_phone="15550000000",
+        to_phone="15550000001",
+        direction="outbound",
+        telephony_params={"Record": "false"},
+        streaming_provider_config=PipecatStreamingConfig(
+            llm_model="gpt-4o-mini",
+            greeting_message=BaseMessage(message="Thanks for calling, how can I help?"),
+            prompt_premble=BaseMessage(message=prompt),
+        ),
+    )
+
+
+def per_call_us(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn()
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+def main():
+    configs = {
+        "short prompt": make_config("You are a friendly assistant."),
+        "taxi prompt": make_config(system_prompt),
+    }
+    for name, config in configs.items():
+        legacy = config.json()
+        encoded = encode_config(config)
+        assert decode_config(encoded) == config
+        print(f"{name}")
+        print(
+            f"  json     {len(legacy):>6} bytes"
+            f"  encode {per_call_us(config.json):>7.1f} us"
+            f"  decode {per_call_us(lambda: BaseCallConfig.parse_raw(legacy)):>7.1f} us"
+        )
+        print(
+            f"  encoded  {len(encoded):>6} bytes"
+            f"  encode {per_call_us(lambda: encode_config(config)):>7.1f} us"
+            f"  decode {per_call_us(lambda: decode_config(encoded)):>7.1f} us"
+        )
+
+        def encode_by_hash():
+            config_hash = provider_config_hash(config.streaming_provider_config)
+            return encode_config(config, provider_config_hash=config_hash)
+
+        print(
+            f"  by hash  {len(encode_by_hash()):>6} bytes"
+            f"  encode {per_call_us(encode_by_hash):>7.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from urllib.parse import urlencode
+
+import aiohttp
+
+from benchmarks.config_encoding import make_config, system_prompt
+from telephony.utils.latency import LatencyHistogram
+
+REQUESTS = int(os.environ.get("BENCH_REQUESTS", 5000))
+CONCURRENCY = [1, 50, 200]
+PORT = 8797
+INBOUND_URL = "/twilio/inbound_call"
+
+
+def twilio_form(i: int) -> bytes:
+    # the fields Twilio posts to a voice webhook
+    return urlencode(
+        {
+            "AccountSid": "AC" + "0" * 32,
+            "ApiVersion": "2010-04-01",
+            "CallSid": f"CA{i:032d}",
+            "CallStatus": "ringing",
+            "Called": "+15550000001",
+            "CalledCity": "",
+            "CalledCountry": "US",
+            "CalledState": "CA",
+            "CalledZip": "",
+            "Caller": "+15550000000",
+            "CallerCity": "",
+            "CallerCountry": "US",
+            "CallerState": "CA",
+            "CallerZip": "",
+            "Direction": "inbound",
+            "From": "+15550000000",
+            "FromCountry": "US",
+            "To": "+15550000001",
+            "ToCountry": "US",
+        }
+    ).encode()
+
+
+def serve():
+    # a single worker, as deployed; the config is saved to the Redis from
+    # REDISHOST/REDISPORT
+    import uvicorn
+    from fastapi import FastAPI
+    from loguru import logger
+
+    from telephony.config_manager.redis_config_manager import RedisConfigManager
+    from telephony.server.admission import AdmissionController, AdmissionLimits
+    from telephony.server.server import TelephonyServer, TwilioInboundCallConfig
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    config = make_config(system_prompt)
+    telephony_server = TelephonyServer(
+        base_url="bench.example.com",
+        config_manager=RedisConfigManager(),
+        inbound_call_configs=[
+            TwilioInboundCallConfig(
+                url=INBOUND_URL,
+                streaming_provider_config=config.streaming_provider_config,
+                twilio_config=config.twilio_config,
+            )
+        ],
+        # measures the webhook itself, not how many calls the worker admits
+        admission_controller=AdmissionController(AdmissionLimits(max_active_calls=10**9)),
+    )
+    app = FastAPI()
+    app.include_router(telephony_server.get_router())
+    uvicorn.run(app, port=PORT, lifespan="off", log_level="warning", access_log=False)
+
+
+async def spike(session: aiohttp.ClientSession, concurrency: int, offset: int):
+    histogram = LatencyHistogram()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def webhook(i: int):
+        async with semaphore:
+            started = time.perf_counter()
+            async with session.post(
+                f"http://127.0.0.1:{PORT}{INBOUND_URL}",
+                data=twilio_form(offset + i),
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            ) as response:
+                body = await response.read()
+                assert response.status == 200 and b"<Stream" in body, body
+            histogram.record((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(webhook(i) for i in range(REQUESTS)))
+    return REQUESTS / (time.perf_counter() - started), histogram
+
+
+async def run_benchmark():
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=max(CONCURRENCY))
+    ) as session:
+        for _ in range(100):
+            try:
+                async with session.get(f"http://127.0.0.1:{PORT}/ready"):
+                    break
+            except aiohttp.ClientError:
+                await asyncio.sleep(0.1)
+        await spike(session, 10, 0)  # warm up connections
+        for concurrency in CONCURRENCY:
+            rate, histogram = await spike(session, concurrency, concurrency * REQUESTS)
+            summary = histogram.summary()
+            print(
+                f"concurrency {concurrency:>3}  {rate:>6.0f} webhooks/s"
+                f"  p50 {summary['p50']:>6.1f} ms  p99 {summary['p99']:>6.1f} ms"
+            )
+
+
+def main():
+    server = multiprocessing.Process(target=serve, daemon=True)
+    server.start()
+    try:
+        asyncio.run(run_benchmark())
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
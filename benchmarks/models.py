@@ -0,0 +1,37 @@
+from benchmarks.config_encoding import make_config, per_call_us, system_prompt
+from telephony.models.events import ActionEvent, CallLatencyEvent, PhoneCallConnectedEvent
+from telephony.models.model import TypedModel
+from telephony.models.telephony import BaseCallConfig
+
+
+def main():
+    config = make_config(system_prompt)
+    events = [
+        PhoneCallConnectedEvent(
+            conversation_id="0" * 32, to_phone_number="15550000001", from_phone_number="15550000000"
+        ),
+        ActionEvent(conversation_id="0" * 32, action_input={"type": "transfer", "to": "15550000002"}),
+        CallLatencyEvent(
+            conversation_id="0" * 32,
+            stages={"tts_first_byte": {"p50": 180.0, "p95": 240.0, "p99": 310.0, "count": 42}},
+        ),
+    ]
+
+    raw = config.json()
+    assert BaseCallConfig.parse_raw(raw) == config
+    print(f"{type(config).__name__} ({len(raw)} bytes)")
+    print(f"  json       {per_call_us(config.json):>7.1f} us")
+    print(f"  parse_raw  {per_call_us(lambda: BaseCallConfig.parse_raw(raw)):>7.1f} us")
+    print(f"  type       {per_call_us(lambda: config.type):>7.2f} us")
+    print(f"  get_cls    {per_call_us(lambda: TypedModel.get_cls(config.type)):>7.2f} us")
+
+    for event in events:
+        raw = event.json()
+        assert type(event).parse_raw(raw) == event
+        print(f"{type(event).__name__} ({len(raw)} bytes)")
+        print(f"  json       {per_call_us(event.json):>7.1f} us")
+        print(f"  parse_raw  {per_call_us(lambda: type(event).parse_raw(raw)):>7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import asyncio
+import os
+import time
+
+import aiohttp
+from aiohttp import web
+
+from telephony.clients.twilio_client import TwilioClient
+from telephony.models.telephony import TwilioConfig
+from telephony.utils.async_requestor import AsyncRequestor
+from telephony.utils.latency import LatencyHistogram
+
+CALLS = int(os.environ.get("BENCH_CALLS", 2000))
+CONCURRENCY = [1, 20]
+PORT = 8798
+
+
+async def create_call(request: web.Request) -> web.Response:
+    await request.post()
+    return web.json_response({"sid": "CA" + "0" * 32})
+
+
+async def dial(client_for_call, concurrency: int) -> tuple[float, LatencyHistogram]:
+    histogram = LatencyHistogram()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_call():
+        async with semaphore:
+            started = time.perf_counter()
+            await client_for_call().create_call("bench", "15550000001", "15550000000")
+            histogram.record((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_call() for _ in range(CALLS)))
+    return CALLS / (time.perf_counter() - started), histogram
+
+
+async def run_benchmark():
+    # a local stand-in for the Calls API; without TLS it understates what a
+    # new connection costs against api.twilio.com
+    app = web.Application()
+    app.router.add_post("/2010-04-01/Accounts/{account_sid}/Calls.json", create_call)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", PORT).start()
+
+    config = TwilioConfig(account_sid="AC" + "0" * 32, auth_token="0" * 32)
+    api_base_url = f"http://127.0.0.1:{PORT}"
+    requestor = AsyncRequestor()
+    cases = {
+        "new client, no keep-alive": (
+            aiohttp.TCPConnector(force_close=True),
+            lambda: TwilioClient("example.com", config, api_base_url),
+        ),
+        "cached client, pooled": (
+            None,
+            lambda: TwilioClient.for_config("example.com", config, api_base_url),
+        ),
+    }
+    for name, (connector, client_for_call) in cases.items():
+        requestor.connector = connector
+        await requestor.close_session()
+        for concurrency in CONCURRENCY:
+            rate, histogram = await dial(client_for_call, concurrency)
+            summary = histogram.summary()
+            print(
+                f"{name:<26} concurrency {concurrency:>3}  {rate:>6.0f} calls/s"
+                f"  p50 {summary['p50']:>5.1f} ms  p99 {summary['p99']:>5.1f} ms"
+            )
+        if connector is not None:
+            await connector.close()
+    await requestor.close_session()
+    await runner.cleanup()
+
+
+def main():
+    asyncio.run(run_benchmark())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import base64
+import json
+import os
+import time
+import tracemalloc
+
+from telephony.utils.twilio_media import (
+    MediaMessageTemplate,
+    media_message_from_json,
+    parse_media_message,
+)
+
+NUM_MESSAGES = int(os.environ.get("BENCH_MESSAGES", 200_000))
+STREAM_SID = "MZ18ad3ab5a668481ce02b83e7395059f0"
+PAYLOAD = base64.b64encode(bytes(range(160))).decode("ascii")
+INBOUND = json.dumps(
+    {
+        "event": "media",
+        "sequenceNumber": "3",
+        "media": {"track": "inbound", "chunk": "1", "timestamp": "5", "payload": PAYLOAD},
+        "streamSid": STREAM_SID,
+    },
+    separators=(",", ":"),
+)
+
+
+def json_inbound():
+    message = json.loads(INBOUND)
+    if message["event"] == "media":
+        return media_message_from_json(message)
+
+
+def json_outbound():
+    return json.dumps(
+        {"event": "media", "streamSid": STREAM_SID, "media": {"payload": PAYLOAD}}
+    )
+
+
+def fast_inbound():
+    return parse_media_message(INBOUND)
+
+
+template = MediaMessageTemplate(STREAM_SID)
+
+
+def fast_outbound():
+    return template.media(PAYLOAD)
+
+
+def messages_per_second(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(NUM_MESSAGES):
+        fn()
+    return NUM_MESSAGES / (time.perf_counter() - start)
+
+
+def bytes_allocated_per_message(fn, iterations: int = 1000) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    total = 0
+    for _ in range(iterations):
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        total += peak - before
+        tracemalloc.reset_peak()
+    tracemalloc.stop()
+    return total / iterations
+
+
+def main():
+    assert fast_inbound() == json_inbound()
+    assert json.loads(fast_outbound()) == json.loads(json_outbound())
+
+    for name, fn in [
+        ("inbound json", json_inbound),
+        ("inbound fast path", fast_inbound),
+        ("outbound json", json_outbound),
+        ("outbound template", fast_outbound),
+    ]:
+        rate = messages_per_second(fn)
+        allocated = bytes_allocated_per_message(fn)
+        print(f"{name:<20} {rate:>12,.0f} msg/s  {allocated:>8,.0f} peak bytes/msg")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from pipecat.audio.vad.silero import SileroVADAnalyzer
+
+from streaming_providers.pipecat.vad import SharedSileroVADAnalyzer
+
+SAMPLE_RATE = 16000
+FRAMES_PER_CALL = int(os.environ.get("BENCH_FRAMES", 200))
+CONCURRENCY = [1, 8, 32, 128]
+
+
+def make_frame(rng) -> bytes:
+    return rng.integers(-4000, 4000, 512, dtype=np.int16).tobytes()
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run_calls(analyzers, frame: bytes) -> float:
+    # one thread per call, like pipecat's per-transport VAD executor
+    def call(analyzer):
+        for _ in range(FRAMES_PER_CALL):
+            analyzer.voice_confidence(frame)
+
+    with ThreadPoolExecutor(len(analyzers)) as executor:
+        start = time.perf_counter()
+        list(executor.map(call, analyzers))
+        return time.perf_counter() - start
+
+
+def main():
+    rng = np.random.default_rng(0)
+    frame = make_frame(rng)
+
+    load_per_call = timed(lambda: SileroVADAnalyzer(sample_rate=SAMPLE_RATE))
+    load_shared = timed(lambda: SharedSileroVADAnalyzer(sample_rate=SAMPLE_RATE))
+    load_shared_again = timed(lambda: SharedSileroVADAnalyzer(sample_rate=SAMPLE_RATE))
+    print(f"load per-call model  {load_per_call * 1000:>8.1f} ms")
+    print(f"load shared (first)  {load_shared * 1000:>8.1f} ms")
+    print(f"load shared (next)   {load_shared_again * 1000:>8.1f} ms")
+
+    for calls in CONCURRENCY:
+        per_call = [SileroVADAnalyzer(sample_rate=SAMPLE_RATE) for _ in range(calls)]
+        shared = [SharedSileroVADAnalyzer(sample_rate=SAMPLE_RATE) for _ in range(calls)]
+        frames = calls * FRAMES_PER_CALL
+        per_call_us = run_calls(per_call, frame) / frames * 1e6
+        shared_us = run_calls(shared, frame) / frames * 1e6
+        print(
+            f"{calls:>4} calls  per-call {per_call_us:>8.1f} us/frame"
+            f"  shared {shared_us:>8.1f} us/frame"
+        )
+
+
+if __name__ == "__main__":
+    main()
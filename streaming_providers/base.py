@@ -18,8 +18,10 @@ class BaseStreamingProvider(ABC):
         streaming_provider_config: StreamingProviderConfig,
         config_manager: BaseConfigManager,
         events_manager: EventsManager | None = None,
+        conversation_id: str | None = None,
     ):
         self.websocket = websocket
+        self.conversation_id = conversation_id
         self.streaming_provider_config = streaming_provider_config
         self.config_manager = config_manager
         self.events_manager = events_manager
@@ -6,7 +6,9 @@ from streaming_providers.models import StreamingProviderConfig
 from streaming_providers.pipecat.pipecat import (
     PipecatStreamingConfig,
     PipecatStreamingProvider,
+    prefetch_greeting,
 )
+from streaming_providers.pipecat.warm_pool import WarmPipelinePool
 from telephony.config_manager.base_config_manager import BaseCallConfig, BaseConfigManager
 from telephony.server.output_devices.abstract_output_device import AbstractOutputDevice
 from telephony.utils.events_manager import EventsManager
@@ -22,10 +24,31 @@ class AbstractStreamingProviderFactory(ABC):
         streaming_provider_config: StreamingProviderConfig,
         config_manager: BaseConfigManager,
         events_manager: EventsManager | None = None,
+        conversation_id: str | None = None,
     ) -> BaseStreamingProvider:
         pass
 
+    async def warm_up(self, streaming_provider_config: StreamingProviderConfig):
+        # called at server startup for each inbound route's config
+        pass
+
+    def warm_call(
+        self, conversation_id: str, streaming_provider_config: StreamingProviderConfig
+    ):
+        # called when an outbound call is placed, before it is answered
+        pass
+
+    def evict_call(self, conversation_id: str):
+        # called when a placed call ends without connecting
+        pass
+
+    async def close(self):
+        pass
+
 class DefaultStreamingProviderFactory(AbstractStreamingProviderFactory):
+    def __init__(self, warm_pool: WarmPipelinePool | None = None):
+        self.warm_pool = warm_pool or WarmPipelinePool()
+
     def create_streaming_provider(
         self,
         websocket: WebSocket,
@@ -34,6 +57,7 @@ class DefaultStreamingProviderFactory(AbstractStreamingProviderFactory):
         streaming_provider_config: StreamingProviderConfig,
         config_manager: BaseConfigManager,
         events_manager: EventsManager | None = None,
+        conversation_id: str | None = None,
     ) -> BaseStreamingProvider:
         if isinstance(streaming_provider_config, PipecatStreamingConfig):
             return PipecatStreamingProvider(
@@ -43,5 +67,26 @@ class DefaultStreamingProviderFactory(AbstractStreamingProviderFactory):
                 provider_config=streaming_provider_config,
                 config_manager=config_manager,
                 events_manager=events_manager,
+                conversation_id=conversation_id,
+                warm_pipeline=self.warm_pool.take(
+                    conversation_id, streaming_provider_config
+                ),
             )
         raise Exception("Invalid streaming config" + streaming_provider_config.type)
+
+    async def warm_up(self, streaming_provider_config: StreamingProviderConfig):
+        if isinstance(streaming_provider_config, PipecatStreamingConfig):
+            self.warm_pool.fill(streaming_provider_config)
+            await prefetch_greeting(streaming_provider_config)
+
+    def warm_call(
+        self, conversation_id: str, streaming_provider_config: StreamingProviderConfig
+    ):
+        if isinstance(streaming_provider_config, PipecatStreamingConfig):
+            self.warm_pool.warm_call(conversation_id, streaming_provider_config)
+
+    def evict_call(self, conversation_id: str):
+        self.warm_pool.evict(conversation_id)
+
+    async def close(self):
+        await self.warm_pool.close()
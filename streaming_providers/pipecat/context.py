@@ -0,0 +1,161 @@
+import asyncio
+from typing import Awaitable, Callable, List
+
+from loguru import logger
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletionMessageParam
+
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+
+from telephony.utils.asyncio import asyncio_create_task
+
+# rough token estimate so the budget can be checked on every message without
+# a tokenizer; OpenAI's rule of thumb is ~4 characters per token
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+DEFAULT_SUMMARY_MODEL = "gpt-4o-mini"
+
+SUMMARY_PROMPT = (
+    "You compress the history of an ongoing phone call between a user and an "
+    "assistant. Write a concise summary that keeps every fact, name, number, "
+    "decision and open question the assistant will need to continue the call. "
+    "Fold the previous summary, if any, into the new one."
+)
+
+Summarizer = Callable[[str | None, List[ChatCompletionMessageParam]], Awaitable[str]]
+
+
+def estimate_tokens(message: ChatCompletionMessageParam) -> int:
+    content = message.get("content") or ""
+    if not isinstance(content, str):
+        content = " ".join(
+            part.get("text", "") for part in content if isinstance(part, dict)
+        )
+    tool_calls = message.get("tool_calls") or []
+    arguments = sum(len(str(call)) for call in tool_calls)
+    return (len(content) + arguments) // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+
+
+def openai_summarizer(api_key: str | None, model: str = DEFAULT_SUMMARY_MODEL) -> Summarizer:
+    client = AsyncOpenAI(api_key=api_key)
+
+    async def summarize(
+        summary: str | None, messages: List[ChatCompletionMessageParam]
+    ) -> str:
+        transcript = "\n".join(
+            f"{message['role']}: {message.get('content') or ''}" for message in messages
+        )
+        if summary:
+            transcript = f"Previous summary:\n{summary}\n\nNew turns:\n{transcript}"
+        response = await client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {"role": "user", "content": transcript},
+            ],
+        )
+        return response.choices[0].message.content or ""
+
+    return summarize
+
+
+class BoundedLLMContext(OpenAILLMContext):
+    """
+    OpenAILLMContext that stays within a token budget on long calls. The
+    messages it is created with (the system prompt) and the last `keep_turns`
+    user turns are always sent verbatim; once the estimate goes over
+    `max_tokens`, the turns before those are folded into a running summary by
+    a background task, and swapped out of the context when it finishes.
+    """
+
+    def __init__(
+        self,
+        messages: List[ChatCompletionMessageParam],
+        summarize: Summarizer,
+        max_tokens: int,
+        keep_turns: int,
+        **kwargs,
+    ):
+        super().__init__(messages, **kwargs)
+        self.max_tokens = max_tokens
+        self.keep_turns = keep_turns
+        self._summarize = summarize
+        self._pinned = len(self._messages)
+        self.summary: str | None = None
+        self._summary_message: ChatCompletionMessageParam | None = None
+        self._summary_task: asyncio.Task | None = None
+
+    def estimated_tokens(self) -> int:
+        return sum(estimate_tokens(message) for message in self._messages)
+
+    def add_message(self, message: ChatCompletionMessageParam):
+        super().add_message(message)
+        self._maybe_compact()
+
+    def add_messages(self, messages: List[ChatCompletionMessageParam]):
+        super().add_messages(messages)
+        self._maybe_compact()
+
+    def cancel_summary(self):
+        if self._summary_task is not None:
+            self._summary_task.cancel()
+            self._summary_task = None
+
+    def _history_start(self) -> int:
+        return self._pinned + (1 if self._has_summary() else 0)
+
+    def _has_summary(self) -> bool:
+        return (
+            self._summary_message is not None
+            and len(self._messages) > self._pinned
+            and self._messages[self._pinned] is self._summary_message
+        )
+
+    def _compactable_end(self) -> int:
+        # index of the first message of the turns that are kept verbatim
+        start = self._history_start()
+        turns = 0
+        for index in range(len(self._messages) - 1, start - 1, -1):
+            if self._messages[index].get("role") == "user":
+                turns += 1
+                if turns == self.keep_turns:
+                    return index
+        return start
+
+    def _maybe_compact(self):
+        if self._summary_task is not None or self.estimated_tokens() <= self.max_tokens:
+            return
+        start, end = self._history_start(), self._compactable_end()
+        if end <= start:
+            return
+        compacted = self._messages[start:end]
+        self._summary_task = asyncio_create_task(self._compact(compacted))
+
+    async def _compact(self, compacted: List[ChatCompletionMessageParam]):
+        try:
+            summary = await self._summarize(self.summary, compacted)
+        except Exception as e:
+            logger.warning(f"Failed to summarize LLM context: {e}")
+            return
+        finally:
+            self._summary_task = None
+
+        start = self._history_start()
+        current = self._messages[start : start + len(compacted)]
+        if len(current) != len(compacted) or any(
+            a is not b for a, b in zip(current, compacted)
+        ):
+            # the context was rewritten while we were summarizing
+            return
+
+        summary_message: ChatCompletionMessageParam = {
+            "role": "system",
+            "content": f"Summary of the call so far:\n{summary}",
+        }
+        self._messages[self._pinned : start + len(compacted)] = [summary_message]
+        self._summary_message = summary_message
+        self.summary = summary
+        logger.debug(
+            f"Compacted {len(compacted)} messages, context is now ~{self.estimated_tokens()} tokens"
+        )
+        self._maybe_compact()
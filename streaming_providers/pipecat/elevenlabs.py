@@ -0,0 +1,33 @@
+from telephony.utils.async_requestor import AsyncRequestor
+
+ELEVENLABS_API_URL = "https://api.elevenlabs.io"
+ELEVENLABS_MODEL = "eleven_flash_v2_5"
+
+
+def output_format_byte_rate(output_format: str) -> int:
+    # e.g. "pcm_24000" is 16-bit PCM and "ulaw_8000" one byte per sample
+    encoding, _, sample_rate = output_format.partition("_")
+    bytes_per_sample = 1 if encoding in ("ulaw", "alaw") else 2
+    return int(sample_rate) * bytes_per_sample
+
+
+async def synthesize(
+    text: str,
+    voice_id: str,
+    output_format: str,
+    api_key: str,
+    model: str = ELEVENLABS_MODEL,
+) -> bytes:
+    async with AsyncRequestor().request(
+        "elevenlabs.text_to_speech",
+        "POST",
+        f"{ELEVENLABS_API_URL}/v1/text-to-speech/{voice_id}",
+        params={"output_format": output_format},
+        headers={"xi-api-key": api_key},
+        json={"text": text, "model_id": model},
+    ) as response:
+        if not response.ok:
+            raise RuntimeError(
+                f"ElevenLabs returned {response.status}: {await response.text()}"
+            )
+        return await response.read()
@@ -6,10 +6,11 @@
 
 import base64
 import json
+import time
 
+from loguru import logger
 from pydantic import BaseModel
 
-from pipecat.audio.utils import pcm_to_ulaw, ulaw_to_pcm
 from pipecat.frames.frames import (
     AudioRawFrame,
     Frame,
@@ -20,65 +21,80 @@ from pipecat.frames.frames import (
 )
 from pipecat.serializers.base_serializer import FrameSerializer, FrameSerializerType
 
+from telephony.models.audio import AudioEncoding
 from telephony.server.output_devices.abstract_output_device import AbstractOutputDevice
+from telephony.utils.audio_codec import UlawDecoder, UlawEncoder
+from telephony.utils.jitter_buffer import JitterBuffer, JitterBufferStats
+from telephony.utils.latency import CallLatencyTracker
+from telephony.utils.twilio_media import (
+    MediaMessage,
+    MediaMessageTemplate,
+    media_message_from_json,
+    parse_media_message,
+)
 
 
 class TwilioFrameSerializer(FrameSerializer):
     class InputParams(BaseModel):
         twilio_sample_rate: int = 8000
         sample_rate: int = 16000
+        # with MULAW, Twilio audio is passed through untouched in both
+        # directions and sample_rate must match twilio_sample_rate
+        audio_encoding: AudioEncoding = AudioEncoding.LINEAR16
 
     def __init__(
         self,
-        stream_sid: str,
+        stream_sid: str | None,
         device: AbstractOutputDevice,
         params: InputParams = InputParams(),
+        latency_tracker: CallLatencyTracker | None = None,
     ):
         self._stream_sid = stream_sid
         self._params = params
         self.device = device
+        self.latency_tracker = latency_tracker
+
+        self._passthrough = params.audio_encoding == AudioEncoding.MULAW
+        assert not self._passthrough or params.sample_rate == params.twilio_sample_rate
+
+        # codec state lives for the whole call so the resampler filters run
+        # continuously across frames
+        self._decoder = UlawDecoder(params.twilio_sample_rate, params.sample_rate)
+        self._encoder: UlawEncoder | None = None
+        # None until Twilio's start message arrives on the websocket
+        self._messages = MediaMessageTemplate(stream_sid) if stream_sid else None
+        self._jitter_buffer = JitterBuffer()
 
     @property
     def type(self) -> FrameSerializerType:
         return FrameSerializerType.TEXT
 
+    @property
+    def jitter_stats(self) -> JitterBufferStats:
+        return self._jitter_buffer.stats
+
     # send ai message
     def serialize(self, frame: Frame) -> str | bytes | None:
         if isinstance(frame, AudioRawFrame):
-            data = frame.audio
-
-            serialized_data = pcm_to_ulaw(
-                data, frame.sample_rate, self._params.twilio_sample_rate
-            )
-            payload = base64.b64encode(serialized_data).decode("utf-8")
-            answer = {
-                "event": "media",
-                "streamSid": self._stream_sid,
-                "media": {"payload": payload},
-            }
-
-            return json.dumps(answer)
+            return self.media_message(self.encode_audio(frame))
 
         if isinstance(frame, StartInterruptionFrame):
-            answer = {"event": "clear", "streamSid": self._stream_sid}
-            return json.dumps(answer)
+            if self._encoder is not None:
+                self._encoder.reset()
+            if self._messages is not None:
+                return self._messages.clear_message
 
 
     # send human message
     def deserialize(self, data: str | bytes) -> Frame | None:
+        media = parse_media_message(data)
+        if media is not None:
+            return self._audio_frame(media)
+
         message = json.loads(data)
 
         if message["event"] == "media":
-            payload_base64 = message["media"]["payload"]
-            payload = base64.b64decode(payload_base64)
-
-            deserialized_data = ulaw_to_pcm(
-                payload, self._params.twilio_sample_rate, self._params.sample_rate
-            )
-            audio_frame = InputAudioRawFrame(
-                audio=deserialized_data, num_channels=1, sample_rate=self._params.sample_rate
-            )
-            return audio_frame
+            return self._audio_frame(media_message_from_json(message))
         elif message["event"] == "dtmf":
             digit = message.get("dtmf", {}).get("digit")
 
@@ -87,6 +103,61 @@ class TwilioFrameSerializer(FrameSerializer):
             except ValueError as e:
                 # Handle case where string doesn't match any enum value
                 return None
+        elif message["event"] == "mark":
+            # Twilio has played everything sent before this mark
+            self.device.on_mark(message["mark"]["name"])
+            return None
+        elif message["event"] == "start":
+            logger.debug(f"Media WS: Received event 'start': {data}")
+            self.set_stream_sid(message["start"]["streamSid"])
+            return None
+        elif message["event"] == "stop":
+            logger.info(f"Inbound audio stats for {self._stream_sid}: {self.jitter_stats}")
+            return None
         else:
             return None
 
+    def set_stream_sid(self, stream_sid: str):
+        self._stream_sid = stream_sid
+        self._messages = MediaMessageTemplate(stream_sid)
+        self.device.set_streaming_id(stream_sid)
+
+    def encode_audio(self, frame: AudioRawFrame) -> bytes:
+        if self._passthrough:
+            return frame.audio
+        if self._encoder is None or self._encoder.in_rate != frame.sample_rate:
+            self._encoder = UlawEncoder(frame.sample_rate, self._params.twilio_sample_rate)
+        return self._encoder.encode(frame.audio)
+
+    def media_message(self, audio: bytes | str) -> str:
+        # str audio is a payload that is already base64 encoded
+        if isinstance(audio, bytes):
+            audio = base64.b64encode(audio).decode("ascii")
+        if self.latency_tracker is not None:
+            self.latency_tracker.mark_first_media()
+        assert self._messages is not None, "Stream SID must be set before sending audio"
+        return self._messages.media(audio)
+
+    def mark_message(self, name: str) -> str:
+        assert self._messages is not None, "Stream SID must be set before sending marks"
+        return self._messages.mark(name)
+
+    def _audio_frame(self, media: MediaMessage) -> InputAudioRawFrame | None:
+        payload = base64.b64decode(media.payload)
+
+        if media.chunk is not None and media.timestamp is not None:
+            arrival_ms = time.monotonic() * 1000
+            released = self._jitter_buffer.push(
+                media.chunk, media.timestamp, payload, arrival_ms
+            )
+            if not released:
+                return None
+            payload = released[0] if len(released) == 1 else b"".join(released)
+
+        if self._passthrough:
+            deserialized_data = payload
+        else:
+            deserialized_data = self._decoder.decode(payload)
+        return InputAudioRawFrame(
+            audio=deserialized_data, num_channels=1, sample_rate=self._params.sample_rate
+        )
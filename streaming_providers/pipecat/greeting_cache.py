@@ -0,0 +1,129 @@
+import asyncio
+import base64
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, NamedTuple, Tuple
+
+from loguru import logger
+
+from streaming_providers.pipecat.elevenlabs import synthesize
+from telephony.constants.constants import MULAW_SILENCE_BYTE
+from telephony.server.output_devices.audio_pacer import DEFAULT_FRAME_SIZE
+from telephony.utils.asyncio import asyncio_create_task
+from telephony.utils.singleton import Singleton
+
+GREETING_OUTPUT_FORMAT = "ulaw_8000"
+DEFAULT_MAX_ENTRIES = 64
+
+
+class GreetingKey(NamedTuple):
+    voice_id: str
+    text: str
+    output_format: str = GREETING_OUTPUT_FORMAT
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256("\0".join(self).encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class GreetingAudio:
+    # 20ms μ-law frames along with their base64 payloads, ready to be sent as
+    # Twilio media messages without touching the codec
+    frames: Tuple[bytes, ...]
+    payloads: Tuple[str, ...]
+
+    @classmethod
+    def from_ulaw(cls, audio: bytes, frame_size: int = DEFAULT_FRAME_SIZE):
+        audio += MULAW_SILENCE_BYTE * (-len(audio) % frame_size)
+        frames = tuple(
+            audio[i : i + frame_size] for i in range(0, len(audio), frame_size)
+        )
+        payloads = tuple(base64.b64encode(frame).decode("ascii") for frame in frames)
+        return cls(frames=frames, payloads=payloads)
+
+    @property
+    def audio(self) -> bytes:
+        return b"".join(self.frames)
+
+
+class GreetingAudioCache(Singleton):
+    """
+    Process-wide cache of synthesized greetings, keyed by voice, text and
+    output format. Entries are kept in an LRU bounded by `max_entries` and, if
+    `cache_dir` is set, written to disk so they survive restarts. Concurrent
+    calls asking for the same greeting share a single synthesis.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        cache_dir: str | None = os.getenv("GREETING_AUDIO_CACHE_DIR"),
+    ):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._entries: OrderedDict[GreetingKey, GreetingAudio] = OrderedDict()
+        self._pending: Dict[GreetingKey, asyncio.Task] = {}
+
+    def get_cached(self, key: GreetingKey) -> GreetingAudio | None:
+        greeting = self._entries.get(key)
+        if greeting is not None:
+            self._entries.move_to_end(key)
+        return greeting
+
+    async def get(self, key: GreetingKey, api_key: str) -> GreetingAudio | None:
+        greeting = self.get_cached(key)
+        if greeting is not None:
+            return greeting
+
+        pending = self._pending.get(key)
+        if pending is None:
+            # the synthesis runs as its own task, so a caller that is cancelled
+            # when its call hangs up doesn't strand the others waiting on it
+            pending = asyncio_create_task(self._load_and_store(key, api_key))
+            self._pending[key] = pending
+        return await asyncio.shield(pending)
+
+    async def _load_and_store(self, key: GreetingKey, api_key: str) -> GreetingAudio | None:
+        try:
+            greeting = await self._load(key, api_key)
+        except Exception as e:
+            logger.warning(f"Failed to synthesize greeting for voice {key.voice_id}: {e}")
+            return None
+        finally:
+            del self._pending[key]
+        self._store(key, greeting)
+        return greeting
+
+    def _store(self, key: GreetingKey, greeting: GreetingAudio):
+        self._entries[key] = greeting
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _load(self, key: GreetingKey, api_key: str) -> GreetingAudio:
+        path = self._path(key)
+        if path is not None and path.exists():
+            audio = await asyncio.to_thread(path.read_bytes)
+            logger.debug(f"Loaded cached greeting from {path}")
+            return GreetingAudio.from_ulaw(audio)
+
+        audio = await synthesize(key.text, key.voice_id, key.output_format, api_key)
+        if path is not None:
+            await asyncio.to_thread(self._write, path, audio)
+        return GreetingAudio.from_ulaw(audio)
+
+    def _path(self, key: GreetingKey) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{key.digest}.{key.output_format}"
+
+    @staticmethod
+    def _write(path: Path, audio: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(audio)
+        os.replace(tmp_path, path)
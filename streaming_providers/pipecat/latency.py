@@ -0,0 +1,45 @@
+from pipecat.frames.frames import (
+    Frame,
+    LLMTextFrame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.observers.base_observer import BaseObserver
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from telephony.utils.latency import CallLatencyTracker, LatencyStage
+
+
+class LatencyObserver(BaseObserver):
+    # Feeds a CallLatencyTracker from the frames flowing through the pipeline,
+    # without adding processors to it. The first outbound media frame is
+    # marked by the serializer.
+    def __init__(self, tracker: CallLatencyTracker):
+        self.tracker = tracker
+        self._last_vad_frame_id: int | None = None
+
+    async def on_push_frame(
+        self,
+        src: FrameProcessor,
+        dst: FrameProcessor,
+        frame: Frame,
+        direction: FrameDirection,
+        timestamp: int,
+    ):
+        # the same frame is observed once per hop through the pipeline
+        if isinstance(frame, (UserStartedSpeakingFrame, UserStoppedSpeakingFrame)):
+            if frame.id == self._last_vad_frame_id:
+                return
+            self._last_vad_frame_id = frame.id
+            if isinstance(frame, UserStartedSpeakingFrame):
+                self.tracker.user_started_speaking()
+            else:
+                self.tracker.user_stopped_speaking()
+        elif isinstance(frame, TranscriptionFrame):
+            self.tracker.mark(LatencyStage.STT)
+        elif isinstance(frame, LLMTextFrame):
+            self.tracker.mark(LatencyStage.LLM_FIRST_TOKEN)
+        elif isinstance(frame, TTSAudioRawFrame):
+            self.tracker.mark(LatencyStage.TTS_FIRST_BYTE)
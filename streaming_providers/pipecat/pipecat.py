@@ -1,28 +1,44 @@
+import asyncio
+from typing import Awaitable
+
 from fastapi import WebSocket
+from loguru import logger
 from streaming_providers.base import BaseStreamingProvider
 from streaming_providers.models import StreamingProviderConfig
 import os
 
-from pipecat.audio.vad.silero import SileroVADAnalyzer
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineParams, PipelineTask
 from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
-from pipecat.services.elevenlabs import ElevenLabsTTSService
-from pipecat.services.deepgram import DeepgramSTTService
-from pipecat.services.openai import OpenAILLMService
-from pipecat.transports.network.fastapi_websocket import (
-    FastAPIWebsocketParams,
-    FastAPIWebsocketTransport,
-)
 
+from streaming_providers.pipecat.context import DEFAULT_SUMMARY_MODEL, BoundedLLMContext
 from streaming_providers.pipecat.frame_serializer import TwilioFrameSerializer
+from streaming_providers.pipecat.latency import LatencyObserver
+from streaming_providers.pipecat.greeting_cache import (
+    GreetingAudio,
+    GreetingAudioCache,
+    GreetingKey,
+)
+from streaming_providers.pipecat.transport import (
+    TwilioWebsocketParams,
+    TwilioWebsocketTransport,
+)
+from streaming_providers.pipecat.vad import (
+    MulawSileroVADAnalyzer,
+    SharedSileroVADAnalyzer,
+)
+from streaming_providers.pipecat.warm_pipeline import WarmPipeline, create_warm_pipeline
 from telephony.config_manager.base_config_manager import (
     BaseCallConfig,
     BaseConfigManager,
 )
+from telephony.constants.constants import DEFAULT_SAMPLING_RATE
+from telephony.models.audio import AudioEncoding
 from telephony.server.output_devices.abstract_output_device import AbstractOutputDevice
+from telephony.utils.asyncio import asyncio_create_task
 from telephony.utils.events_manager import EventsManager
+from telephony.utils.latency import CallLatencyTracker
 
 
 class PipecatStreamingConfig(
@@ -32,6 +48,32 @@ class PipecatStreamingConfig(
     llm_model: str | None = "gpt-4o"
     openai_api_key: str | None = None
     elevenlabs_api_key: str | None = None
+    # MULAW keeps the call audio as Twilio's 8kHz μ-law from end to end: STT
+    # and TTS speak it natively and only the VAD sees decoded audio
+    audio_encoding: AudioEncoding = AudioEncoding.LINEAR16
+    voice_id: str = "21m00Tcm4TlvDq8ikWAM"
+    # play a pre-synthesized greeting instead of having the LLM say it
+    cache_greeting: bool = True
+    # once the LLM context goes over this many tokens, turns older than the
+    # last `context_keep_turns` are summarized; None keeps the full history
+    context_max_tokens: int | None = 4000
+    context_keep_turns: int = 6
+    summary_model: str = DEFAULT_SUMMARY_MODEL
+
+    def get_elevenlabs_api_key(self) -> str:
+        return self.elevenlabs_api_key or os.getenv("ELEVENLABS_API_KEY", "")
+
+    def get_greeting_key(self) -> GreetingKey | None:
+        if self.greeting_message is None or not self.cache_greeting:
+            return None
+        return GreetingKey(voice_id=self.voice_id, text=self.greeting_message.message)
+
+
+async def prefetch_greeting(config: PipecatStreamingConfig) -> GreetingAudio | None:
+    key = config.get_greeting_key()
+    if key is None:
+        return None
+    return await GreetingAudioCache().get(key, config.get_elevenlabs_api_key())
 
 
 class PipecatStreamingProvider(BaseStreamingProvider):
@@ -43,6 +85,8 @@ class PipecatStreamingProvider(BaseStreamingProvider):
         provider_config: PipecatStreamingConfig,
         config_manager: BaseConfigManager,
         events_manager: EventsManager | None = None,
+        conversation_id: str | None = None,
+        warm_pipeline: Awaitable[WarmPipeline] | None = None,
     ):
         super().__init__(
             websocket=websocket,
@@ -51,47 +95,71 @@ class PipecatStreamingProvider(BaseStreamingProvider):
             streaming_provider_config=provider_config,
             config_manager=config_manager,
             events_manager=events_manager,
+            conversation_id=conversation_id,
         )
 
         self.call_config = call_config
         self.provider_config = provider_config
         self.config_manager = config_manager
         self.device = device
+        self.runner: PipelineRunner | None = None
+        self.context: OpenAILLMContext | None = None
+        self._greet_task: asyncio.Task | None = None
+        self.warm_pipeline = warm_pipeline
 
     async def start(self):
-        stream_id = self.device.telephony_stream_id
-        assert stream_id is not None, "Stream ID must be provided"
+        # the pipeline starts right away, so the STT and TTS connections are
+        # opened while Twilio's start message is still on its way; the
+        # serializer picks up the stream SID from it
+        native_mulaw = self.provider_config.audio_encoding == AudioEncoding.MULAW
+        # usually a cache hit, and otherwise synthesized while the pipeline is
+        # being built
+        greeting_task = asyncio_create_task(prefetch_greeting(self.provider_config))
+        # created while the connect_call Sentry transaction is current, so
+        # turn spans are attached to it
+        latency_tracker = CallLatencyTracker(
+            self.conversation_id or "",
+            self.events_manager,
+            connected_at=self.device.connected_at,
+        )
 
-        transport = FastAPIWebsocketTransport(
+        if native_mulaw:
+            vad_analyzer = MulawSileroVADAnalyzer()
+            serializer_params = TwilioFrameSerializer.InputParams(
+                sample_rate=DEFAULT_SAMPLING_RATE, audio_encoding=AudioEncoding.MULAW
+            )
+            sample_rates = {
+                "audio_in_sample_rate": DEFAULT_SAMPLING_RATE,
+                "audio_out_sample_rate": DEFAULT_SAMPLING_RATE,
+            }
+        else:
+            vad_analyzer = SharedSileroVADAnalyzer()
+            serializer_params = TwilioFrameSerializer.InputParams()
+            sample_rates = {}
+
+        transport = TwilioWebsocketTransport(
             websocket=self.websocket,
-            params=FastAPIWebsocketParams(
+            params=TwilioWebsocketParams(
                 audio_out_enabled=True,
                 add_wav_header=False,
                 vad_enabled=True,
-                vad_analyzer=SileroVADAnalyzer(),
+                vad_analyzer=vad_analyzer,
                 vad_audio_passthrough=True,
-                serializer=TwilioFrameSerializer(stream_id, self.device),
+                serializer=TwilioFrameSerializer(
+                    self.device.telephony_stream_id,
+                    self.device,
+                    params=serializer_params,
+                    latency_tracker=latency_tracker,
+                ),
+                **sample_rates,
             ),
         )
 
-        llm = OpenAILLMService(api_key=os.getenv("OPENAI_API_KEY"), model="gpt-4o")
-
-        stt = DeepgramSTTService(api_key=os.getenv("DEEPGRAM_API_KEY", ""))
-
-        tts = ElevenLabsTTSService(
-            api_key=os.getenv("ELEVENLABS_API_KEY", ""),
-            voice_id="21m00Tcm4TlvDq8ikWAM",
-        )
-
-        messages = [
-            {
-                "role": "system",
-                "content": self.provider_config.prompt_premble.message
-                + "\n Your output will be converted to audio so don't include special characters in your answers.",
-            },
-        ]
-
-        context = OpenAILLMContext(messages)  # type: ignore
+        warm_pipeline = await self._take_warm_pipeline()
+        stt, llm, tts = warm_pipeline.stt, warm_pipeline.llm, warm_pipeline.tts
+        messages = warm_pipeline.messages
+        context = warm_pipeline.context
+        self.context = context
         context_aggregator = llm.create_context_aggregator(context)
 
         pipeline = Pipeline(
@@ -106,10 +174,27 @@ class PipecatStreamingProvider(BaseStreamingProvider):
             ]
         )
 
-        task = PipelineTask(pipeline, params=PipelineParams(allow_interruptions=True))
+        task = PipelineTask(
+            pipeline,
+            params=PipelineParams(
+                allow_interruptions=True,
+                observers=[LatencyObserver(latency_tracker)],
+            ),
+        )
+
+        async def greet():
+            greeting = await greeting_task
+            await self.device.wait_for_stream()
+            if greeting is not None and self.provider_config.greeting_message:
+                transport.output().play_greeting(greeting)
+                messages.append(
+                    {
+                        "role": "assistant",
+                        "content": self.provider_config.greeting_message.message,
+                    }
+                )
+                return
 
-        @transport.event_handler("on_client_connected")
-        async def on_client_connected(transport, client):
             # since pipecat don't have a way to send the greeting message,
             # we need to instruct the agent to first send the greeting message as part of the prompt
             if self.provider_config.greeting_message is not None:
@@ -123,14 +208,41 @@ class PipecatStreamingProvider(BaseStreamingProvider):
 
             await task.queue_frames([context_aggregator.user().get_context_frame()])
 
+        @transport.event_handler("on_client_connected")
+        async def on_client_connected(transport, client):
+            # called before the StartFrame goes down the pipeline, so waiting
+            # here would hold back the STT and TTS connections
+            self._greet_task = asyncio_create_task(greet())
+
         @transport.event_handler("on_client_disconnected")
         async def on_client_disconnected(transport, client):
             await task.cancel()
 
         self.runner = PipelineRunner(handle_sigint=False)
 
-        await self.runner.run(task)
+        try:
+            await self.runner.run(task)
+        finally:
+            self._cancel_greet()
+            latency_tracker.finish()
+
+    async def _take_warm_pipeline(self) -> WarmPipeline:
+        if self.warm_pipeline is not None:
+            try:
+                return await self.warm_pipeline
+            except Exception as e:
+                logger.warning(f"Failed to warm pipeline, building a new one: {e}")
+        # connects when the pipeline starts
+        return create_warm_pipeline(self.provider_config)
 
     async def stop(self):
         if self.runner is not None:
             await self.runner.cancel()
+        if isinstance(self.context, BoundedLLMContext):
+            self.context.cancel_summary()
+        self._cancel_greet()
+
+    def _cancel_greet(self):
+        if self._greet_task is not None:
+            self._greet_task.cancel()
+            self._greet_task = None
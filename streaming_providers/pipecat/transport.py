@@ -0,0 +1,225 @@
+import asyncio
+import base64
+from collections import deque
+from typing import Deque, List, Tuple
+
+from fastapi import WebSocket
+from starlette.websockets import WebSocketState
+
+from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
+    Frame,
+    LLMFullResponseEndFrame,
+    OutputAudioRawFrame,
+    StartFrame,
+    StartInterruptionFrame,
+    TTSTextFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection
+from pipecat.transports.base_transport import BaseTransport
+from pipecat.transports.network.fastapi_websocket import (
+    FastAPIWebsocketCallbacks,
+    FastAPIWebsocketInputTransport,
+    FastAPIWebsocketOutputTransport,
+    FastAPIWebsocketParams,
+    FastAPIWebsocketTransport,
+)
+
+from streaming_providers.pipecat.frame_serializer import TwilioFrameSerializer
+from streaming_providers.pipecat.greeting_cache import GreetingAudio
+from telephony.server.output_devices.audio_chunk import AudioChunk
+from telephony.server.output_devices.audio_pacer import AudioPacer, PacedFrame
+from telephony.utils.asyncio import asyncio_create_task
+
+# frames of audio between two Twilio marks
+MARK_INTERVAL_FRAMES = 10
+
+
+class TwilioWebsocketParams(FastAPIWebsocketParams):
+    serializer: TwilioFrameSerializer
+
+
+class TwilioWebsocketOutputTransport(FastAPIWebsocketOutputTransport):
+    """
+    Sends audio through an AudioPacer and follows it with a Twilio mark every
+    MARK_INTERVAL_FRAMES frames, tracked as AudioChunks on the output device.
+    Everything is written through the device's bounded send queue.
+    The bot's words are held back until the mark covering their audio comes
+    back, so the assistant context only gets what the caller actually heard;
+    on interruption the unplayed chunks and their words are dropped.
+    """
+
+    def __init__(self, websocket: WebSocket, params: TwilioWebsocketParams, **kwargs):
+        super().__init__(websocket, params, **kwargs)
+        self._serializer = params.serializer
+        self._device = params.serializer.device
+        self._pacer = AudioPacer(send=self._send_media)
+        self._greeting_task: asyncio.Task | None = None
+
+        self._frames_sent = 0
+        self._frames_played = 0
+        self._unmarked_frames: List[bytes] = []
+        self._held_text: Deque[Tuple[int, Frame]] = deque()
+        self._text_released = asyncio.Event()
+        self._text_task: asyncio.Task | None = None
+
+    async def start(self, frame: StartFrame):
+        await super().start(frame)
+        self._pacer.start()
+        if self._text_task is None:
+            self._text_task = self.create_task(self._release_text_task_handler())
+
+    async def stop(self, frame: EndFrame):
+        await super().stop(frame)
+        await self._pacer.wait_until_done()
+        await self._device.drain()
+        await self._cancel_greeting()
+        await self._pacer.stop()
+        await self._stop_text_task()
+        # the call is over, nothing more will be played
+        while self._held_text:
+            await super().push_frame(self._held_text.popleft()[1])
+
+    async def cancel(self, frame: CancelFrame):
+        await super().cancel(frame)
+        await self._cancel_greeting()
+        await self._pacer.stop()
+        await self._stop_text_task()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        if isinstance(frame, StartInterruptionFrame):
+            # drop queued audio before the clear message goes out, and forget
+            # everything that was sent but not played yet
+            self._pacer.interrupt()
+            self._device.interrupt()
+            self._unmarked_frames.clear()
+            self._held_text.clear()
+            self._frames_played = self._frames_sent
+        await super().process_frame(frame, direction)
+
+    async def push_frame(self, frame: Frame, direction: FrameDirection = FrameDirection.DOWNSTREAM):
+        if direction == FrameDirection.DOWNSTREAM and isinstance(
+            frame, (TTSTextFrame, LLMFullResponseEndFrame)
+        ):
+            # released by the mark of the last audio queued before it
+            position = self._frames_sent + self._pacer.buffered_frames
+            self._held_text.append((position, frame))
+            self._text_released.set()
+            return
+        await super().push_frame(frame, direction)
+
+    async def write_raw_audio_frames(self, frames: bytes):
+        if self._websocket.client_state != WebSocketState.CONNECTED:
+            await super().write_raw_audio_frames(frames)
+            return
+
+        frame = OutputAudioRawFrame(
+            audio=frames,
+            sample_rate=self._params.audio_out_sample_rate,
+            num_channels=self._params.audio_out_channels,
+        )
+        # the pacer blocks here once its buffer is full, which keeps the sink
+        # task running at real-time pace
+        await self._pacer.write(self._serializer.encode_audio(frame))
+
+    def play_greeting(self, greeting: GreetingAudio):
+        # the greeting goes out through the pacer like any other audio, so the
+        # caller can interrupt it and the first bot response queues behind it.
+        # It may be played before the pipeline has finished starting.
+        self._pacer.start()
+        self._greeting_task = asyncio_create_task(
+            self._pacer.write_frames(greeting.payloads)
+        )
+
+    async def _cancel_greeting(self):
+        if self._greeting_task is not None:
+            self._greeting_task.cancel()
+            try:
+                await self._greeting_task
+            except asyncio.CancelledError:
+                pass
+            self._greeting_task = None
+
+    async def _send_media(self, audio: PacedFrame):
+        if self._websocket.client_state != WebSocketState.CONNECTED:
+            return
+        await self._device.send_audio(self._serializer.media_message(audio))
+
+        self._frames_sent += 1
+        self._unmarked_frames.append(
+            base64.b64decode(audio) if isinstance(audio, str) else audio
+        )
+        if (
+            len(self._unmarked_frames) >= MARK_INTERVAL_FRAMES
+            or self._pacer.buffered_frames == 0
+        ):
+            await self._send_mark()
+
+    async def _send_mark(self):
+        chunk = AudioChunk(
+            data=b"".join(self._unmarked_frames), end_frame=self._frames_sent
+        )
+        chunk.on_play = lambda: self._on_chunk_played(chunk)
+        self._unmarked_frames.clear()
+        name = self._device.track_chunk(chunk)
+        self._device.send_control(self._serializer.mark_message(name))
+
+    async def _send_data(self, data: str | bytes):
+        # anything else the base transport writes, like the clear message on
+        # interruption, goes out through the device's queue as control
+        if isinstance(data, bytes):
+            await super()._send_data(data)
+        else:
+            self._device.send_control(data)
+
+    def _on_chunk_played(self, chunk: AudioChunk):
+        self._frames_played = max(self._frames_played, chunk.end_frame)
+        self._text_released.set()
+
+    async def _release_text_task_handler(self):
+        while True:
+            await self._text_released.wait()
+            self._text_released.clear()
+            while self._held_text and self._held_text[0][0] <= self._frames_played:
+                await super().push_frame(self._held_text.popleft()[1])
+
+    async def _stop_text_task(self):
+        if self._text_task is not None:
+            await self.cancel_task(self._text_task)
+            self._text_task = None
+
+
+class TwilioWebsocketTransport(FastAPIWebsocketTransport):
+    def __init__(
+        self,
+        websocket: WebSocket,
+        params: TwilioWebsocketParams,
+        input_name: str | None = None,
+        output_name: str | None = None,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ):
+        BaseTransport.__init__(
+            self, input_name=input_name, output_name=output_name, loop=loop
+        )
+        self._params = params
+
+        self._callbacks = FastAPIWebsocketCallbacks(
+            on_client_connected=self._on_client_connected,
+            on_client_disconnected=self._on_client_disconnected,
+            on_session_timeout=self._on_session_timeout,
+        )
+
+        self._input = FastAPIWebsocketInputTransport(
+            websocket, self._params, self._callbacks, name=self._input_name
+        )
+        self._output = TwilioWebsocketOutputTransport(
+            websocket, self._params, name=self._output_name
+        )
+
+        self._register_event_handler("on_client_connected")
+        self._register_event_handler("on_client_disconnected")
+        self._register_event_handler("on_session_timeout")
+
+    def output(self) -> TwilioWebsocketOutputTransport:
+        return self._output
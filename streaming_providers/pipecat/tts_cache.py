@@ -0,0 +1,210 @@
+import asyncio
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncGenerator, Awaitable, Callable, List, NamedTuple, Set, Tuple
+
+from loguru import logger
+
+from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
+    Frame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+)
+from pipecat.services.elevenlabs import ElevenLabsTTSService
+
+from streaming_providers.pipecat.elevenlabs import (
+    ELEVENLABS_MODEL,
+    output_format_byte_rate,
+    synthesize,
+)
+from telephony.utils.asyncio import asyncio_create_task
+from telephony.utils.segment_store import SegmentStore
+from telephony.utils.singleton import Singleton
+
+# only short utterances repeat verbatim often enough to be worth caching
+DEFAULT_MAX_PHRASE_CHARS = 80
+DEFAULT_MAX_MEMORY_BYTES = 32 * 1024 * 1024
+# a phrase is synthesized for the cache once it has been spoken this many times
+DEFAULT_ADMIT_AFTER = 2
+MAX_TRACKED_PHRASES = 10_000
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_phrase(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+class PhraseKey(NamedTuple):
+    text: str
+    voice_id: str
+    output_format: str
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256("\0".join(self).encode()).hexdigest()
+
+
+@dataclass
+class PhraseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    disk_hits: int = 0
+    fills: int = 0
+    failed_fills: int = 0
+    bytes_served: int = 0
+    memory_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class PhraseAudioCache(Singleton):
+    """
+    Process-wide cache of synthesized short phrases, keyed by normalized text,
+    voice and output format. Audio is held in an LRU bounded by
+    `max_memory_bytes` in front of an optional mmap-backed SegmentStore in
+    `cache_dir`. Phrases are only synthesized for the cache once they have
+    been seen `admit_after` times, so one-off sentences cost nothing extra.
+    """
+
+    def __init__(
+        self,
+        max_phrase_chars: int = DEFAULT_MAX_PHRASE_CHARS,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        admit_after: int = DEFAULT_ADMIT_AFTER,
+        cache_dir: str | None = os.getenv("TTS_PHRASE_CACHE_DIR"),
+    ):
+        self.max_phrase_chars = max_phrase_chars
+        self.max_memory_bytes = max_memory_bytes
+        self.admit_after = admit_after
+        self.stats = PhraseCacheStats()
+
+        self._entries: OrderedDict[PhraseKey, bytes] = OrderedDict()
+        self._store = SegmentStore(cache_dir) if cache_dir else None
+        self._seen: OrderedDict[PhraseKey, int] = OrderedDict()
+        self._filling: Set[PhraseKey] = set()
+
+    def key(self, text: str, voice_id: str, output_format: str) -> PhraseKey | None:
+        phrase = normalize_phrase(text)
+        if not phrase or len(phrase) > self.max_phrase_chars:
+            return None
+        return PhraseKey(phrase, voice_id, output_format)
+
+    def get(self, key: PhraseKey) -> bytes | None:
+        audio = self._entries.get(key)
+        if audio is not None:
+            self._entries.move_to_end(key)
+        elif self._store is not None:
+            audio = self._store.get(key.digest)
+            if audio is not None:
+                self.stats.disk_hits += 1
+                self._remember(key, audio)
+
+        if audio is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        self.stats.bytes_served += len(audio)
+        return audio
+
+    def admit(self, key: PhraseKey, synthesize: Callable[[], Awaitable[bytes]]):
+        # called on a miss; synthesizes the phrase in the background once it
+        # has proven to repeat
+        count = self._seen.pop(key, 0) + 1
+        self._seen[key] = count
+        if len(self._seen) > MAX_TRACKED_PHRASES:
+            self._seen.popitem(last=False)
+        if count >= self.admit_after and key not in self._filling:
+            self._filling.add(key)
+            asyncio_create_task(self._fill(key, synthesize))
+
+    async def put(self, key: PhraseKey, audio: bytes):
+        self._remember(key, audio)
+        if self._store is not None:
+            await asyncio.to_thread(self._store.put, key.digest, audio)
+
+    def _remember(self, key: PhraseKey, audio: bytes):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.stats.memory_bytes -= len(previous)
+        self._entries[key] = audio
+        self.stats.memory_bytes += len(audio)
+        while self.stats.memory_bytes > self.max_memory_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.stats.memory_bytes -= len(evicted)
+
+    async def _fill(self, key: PhraseKey, synthesize: Callable[[], Awaitable[bytes]]):
+        try:
+            await self.put(key, await synthesize())
+            self._seen.pop(key, None)
+            self.stats.fills += 1
+        except Exception as e:
+            logger.warning(f"Failed to cache TTS phrase {key.text!r}: {e}")
+            self.stats.failed_fills += 1
+        finally:
+            self._filling.discard(key)
+
+
+def spread_word_times(text: str, duration: float) -> List[Tuple[str, float]]:
+    # cached audio has no alignment, so words are spaced evenly over it
+    words = text.split()
+    return [(word, duration * i / len(words)) for i, word in enumerate(words)]
+
+
+class CachedElevenLabsTTSService(ElevenLabsTTSService):
+    # Serves repeated short phrases from PhraseAudioCache instead of the
+    # ElevenLabs websocket. A hit is only used at the start of a response,
+    # while nothing is in flight on the websocket, so audio stays in order.
+    def __init__(self, *, cache: PhraseAudioCache | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self._phrase_cache = cache or PhraseAudioCache()
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame | None, None]:
+        output_format = self._settings["output_format"]
+        key = self._phrase_cache.key(text, self._voice_id, output_format)
+        if key is None or self._started:
+            async for frame in super().run_tts(text):
+                yield frame
+            return
+
+        audio = self._phrase_cache.get(key)
+        if audio is None:
+            self._phrase_cache.admit(key, self._synthesizer(text))
+            async for frame in super().run_tts(text):
+                yield frame
+            return
+
+        logger.debug(f"Playing cached TTS: [{text}]")
+        yield TTSStartedFrame()
+        self._started = True
+        self.start_word_timestamps()
+        yield TTSAudioRawFrame(audio, self.sample_rate, 1)
+        duration = len(audio) / output_format_byte_rate(output_format)
+        await self.add_word_timestamps(spread_word_times(text, duration))
+        self._cumulative_time = duration
+
+    def _synthesizer(self, text: str) -> Callable[[], Awaitable[bytes]]:
+        voice_id = self._voice_id
+        output_format = self._settings["output_format"]
+        model = self.model_name or ELEVENLABS_MODEL
+        return lambda: synthesize(text, voice_id, output_format, self._api_key, model)
+
+    async def stop(self, frame: EndFrame):
+        await super().stop(frame)
+        self._log_stats()
+
+    async def cancel(self, frame: CancelFrame):
+        await super().cancel(frame)
+        self._log_stats()
+
+    def _log_stats(self):
+        stats = self._phrase_cache.stats
+        logger.info(f"TTS phrase cache hit rate {stats.hit_rate:.1%}: {stats}")
@@ -0,0 +1,197 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from importlib import resources
+from typing import Dict, List, Tuple
+
+import numpy as np
+import onnxruntime
+from loguru import logger
+
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams, VADState
+
+from telephony.constants.constants import DEFAULT_SAMPLING_RATE
+from telephony.utils.audio_codec import ulaw_decode
+from telephony.utils.singleton import Singleton
+
+SILERO_SAMPLE_RATES = (8000, 16000)
+# how often a call's recurrent state is reset, same as pipecat's analyzer
+MODEL_RESET_STATES_SECONDS = 5.0
+DEFAULT_MAX_BATCH_SIZE = 128
+DEFAULT_MAX_WAIT_SECONDS = 0.004
+# a stream that hasn't sent a frame for this long is no longer waited on
+STREAM_IDLE_SECONDS = 0.5
+
+
+class SileroVADStream:
+    # recurrent state of one call, carried between batched inferences
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+        self.context_size = 64 if sample_rate == 16000 else 32
+        self.reset()
+
+    def reset(self):
+        self.state = np.zeros((2, 1, 128), dtype=np.float32)
+        self.context = np.zeros(self.context_size, dtype=np.float32)
+        self.last_reset_time = time.monotonic()
+
+
+class SileroVADService(Singleton):
+    """
+    Process-wide Silero VAD. The ONNX model is loaded once and frames from all
+    active calls are collected for a few milliseconds and run as a single
+    batched inference, with each call keeping its own recurrent state.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+        num_threads: int = 1,
+    ):
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+
+        logger.debug("Loading shared Silero VAD model...")
+        model_path = str(
+            resources.files("pipecat.audio.vad.data").joinpath("silero_vad.onnx")
+        )
+        options = onnxruntime.SessionOptions()
+        options.inter_op_num_threads = 1
+        options.intra_op_num_threads = num_threads
+        self._session = onnxruntime.InferenceSession(
+            model_path, providers=["CPUExecutionProvider"], sess_options=options
+        )
+        logger.debug("Loaded shared Silero VAD")
+
+        self._requests: queue.SimpleQueue[
+            Tuple[SileroVADStream, np.ndarray, Future]
+        ] = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._last_seen: Dict[SileroVADStream, float] = {}
+
+    def create_stream(self, sample_rate: int) -> SileroVADStream:
+        if sample_rate not in SILERO_SAMPLE_RATES:
+            raise ValueError("Silero VAD sample rate needs to be 16000 or 8000")
+        return SileroVADStream(sample_rate)
+
+    def voice_confidence(self, stream: SileroVADStream, audio: np.ndarray) -> float:
+        # blocks the calling thread (pipecat runs VAD in an executor) until
+        # the batch containing this frame has been inferred
+        self._ensure_running()
+        future: Future = Future()
+        self._requests.put((stream, audio, future))
+        return future.result()
+
+    def _ensure_running(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="silero-vad-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def _active_streams(self, now: float) -> int:
+        idle = [
+            stream
+            for stream, last_seen in self._last_seen.items()
+            if now - last_seen > STREAM_IDLE_SECONDS
+        ]
+        for stream in idle:
+            del self._last_seen[stream]
+        return len(self._last_seen)
+
+    def _collect_batch(self) -> List[Tuple[SileroVADStream, np.ndarray, Future]]:
+        batch = [self._requests.get()]
+        now = time.monotonic()
+        self._last_seen[batch[0][0]] = now
+        # only wait as long as other active calls may still be sending a frame,
+        # so a lone call is never delayed
+        expected = min(self._active_streams(now), self.max_batch_size)
+        deadline = now + self.max_wait_seconds
+        while len(batch) < expected:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            self._last_seen[request[0]] = time.monotonic()
+            batch.append(request)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            by_rate: Dict[int, List[Tuple[SileroVADStream, np.ndarray, Future]]] = {}
+            for request in batch:
+                by_rate.setdefault(request[0].sample_rate, []).append(request)
+            for sample_rate, requests in by_rate.items():
+                try:
+                    self.infer_batch(sample_rate, requests)
+                except Exception as e:
+                    logger.error(f"Error analyzing audio with Silero VAD: {e}")
+                    for _, _, future in requests:
+                        if not future.done():
+                            future.set_result(0.0)
+
+    def infer_batch(
+        self,
+        sample_rate: int,
+        requests: List[Tuple[SileroVADStream, np.ndarray, Future]],
+    ):
+        now = time.monotonic()
+        for stream, _, _ in requests:
+            # the model doesn't need the whole history, and its state drifts
+            # if it is never reset
+            if now - stream.last_reset_time >= MODEL_RESET_STATES_SECONDS:
+                stream.reset()
+
+        inputs = np.stack(
+            [np.concatenate((stream.context, audio)) for stream, audio, _ in requests]
+        )
+        states = np.concatenate([stream.state for stream, _, _ in requests], axis=1)
+        output, new_states = self._session.run(
+            None,
+            {
+                "input": inputs,
+                "state": states,
+                "sr": np.array(sample_rate, dtype=np.int64),
+            },
+        )
+
+        for i, (stream, _, future) in enumerate(requests):
+            stream.state = new_states[:, i : i + 1, :]
+            stream.context = inputs[i, -stream.context_size :]
+            future.set_result(float(output[i][0]))
+
+
+class SharedSileroVADAnalyzer(VADAnalyzer):
+    # Drop-in for pipecat's SileroVADAnalyzer backed by SileroVADService, so a
+    # call costs a few hundred bytes of state instead of its own model.
+    def __init__(self, *, sample_rate: int = 16000, params: VADParams = VADParams()):
+        self._service = SileroVADService()
+        self._stream = self._service.create_stream(sample_rate)
+        super().__init__(sample_rate=sample_rate, num_channels=1, params=params)
+
+    def num_frames_required(self) -> int:
+        return 512 if self.sample_rate == 16000 else 256
+
+    def voice_confidence(self, buffer) -> float:
+        audio = np.frombuffer(buffer, dtype=np.int16).astype(np.float32) / 32768.0
+        return self._service.voice_confidence(self._stream, audio)
+
+
+class MulawSileroVADAnalyzer(SharedSileroVADAnalyzer):
+    # In native μ-law mode the pipeline audio stays encoded end to end, so the
+    # VAD decodes its own linear copy of each frame.
+    def __init__(self, *, params: VADParams = VADParams()):
+        super().__init__(sample_rate=DEFAULT_SAMPLING_RATE, params=params)
+
+    def analyze_audio(self, buffer) -> VADState:
+        return super().analyze_audio(ulaw_decode(buffer))
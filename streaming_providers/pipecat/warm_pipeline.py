@@ -0,0 +1,148 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List
+
+from deepgram import LiveOptions
+from loguru import logger
+from openai.types.chat import ChatCompletionMessageParam
+
+from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+from pipecat.services.deepgram import DeepgramSTTService
+from pipecat.services.openai import OpenAILLMService
+
+from streaming_providers.pipecat.context import BoundedLLMContext, openai_summarizer
+from streaming_providers.pipecat.tts_cache import CachedElevenLabsTTSService
+from telephony.constants.constants import DEFAULT_SAMPLING_RATE
+from telephony.models.audio import AudioEncoding
+from telephony.utils.asyncio import asyncio_create_task
+
+if TYPE_CHECKING:
+    from streaming_providers.pipecat.pipecat import PipecatStreamingConfig
+
+
+class WarmDeepgramSTTService(DeepgramSTTService):
+    # Can open its Deepgram connection before it is part of a pipeline; the
+    # SDK keeps an idle connection alive
+    async def preconnect(self):
+        await self._connect()
+
+    async def release(self):
+        await self._disconnect()
+
+    async def _connect(self):
+        if await self._connection.is_connected():
+            return
+        await super()._connect()
+
+
+class WarmElevenLabsTTSService(CachedElevenLabsTTSService):
+    # Can open its ElevenLabs websocket before it is part of a pipeline. The
+    # pipeline's receive and keepalive tasks take over the open socket when
+    # it starts; until then our own keepalive stops ElevenLabs from closing it.
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._idle_keepalive_task: asyncio.Task | None = None
+
+    async def preconnect(self):
+        await self._connect_websocket()
+        if self._websocket is not None:
+            self._idle_keepalive_task = asyncio_create_task(
+                self._keepalive_task_handler()
+            )
+
+    async def release(self):
+        self._stop_idle_keepalive()
+        await self._disconnect_websocket()
+
+    async def _connect(self):
+        self._stop_idle_keepalive()
+        if self._websocket is None:
+            await self._connect_websocket()
+        self._receive_task = self.create_task(self._receive_task_handler(self.push_error))
+        self._keepalive_task = self.create_task(self._keepalive_task_handler())
+
+    def _stop_idle_keepalive(self):
+        if self._idle_keepalive_task is not None:
+            self._idle_keepalive_task.cancel()
+            self._idle_keepalive_task = None
+
+
+@dataclass
+class WarmPipeline:
+    """
+    The parts of a call's pipeline that don't depend on the Twilio websocket:
+    the STT, LLM and TTS services and the LLM context with the system prompt.
+    `connect` opens the upstream connections ahead of the call; a pipeline
+    that is never connected opens them when it starts.
+    """
+
+    stt: WarmDeepgramSTTService
+    llm: OpenAILLMService
+    tts: WarmElevenLabsTTSService
+    context: OpenAILLMContext
+    messages: List[ChatCompletionMessageParam]
+    created_at: float = field(default_factory=time.monotonic)
+    connected: bool = False
+
+    async def connect(self):
+        await asyncio.gather(self.stt.preconnect(), self.tts.preconnect())
+        self.connected = True
+
+    async def close(self):
+        # for pipelines that were never attached to a call
+        if isinstance(self.context, BoundedLLMContext):
+            self.context.cancel_summary()
+        results = await asyncio.gather(
+            self.stt.release(), self.tts.release(), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to close warm pipeline: {result}")
+        self.connected = False
+
+
+def create_warm_pipeline(config: "PipecatStreamingConfig") -> WarmPipeline:
+    llm = OpenAILLMService(api_key=os.getenv("OPENAI_API_KEY"), model="gpt-4o")
+
+    stt: WarmDeepgramSTTService
+    tts: WarmElevenLabsTTSService
+    if config.audio_encoding == AudioEncoding.MULAW:
+        stt = WarmDeepgramSTTService(
+            api_key=os.getenv("DEEPGRAM_API_KEY", ""),
+            live_options=LiveOptions(encoding="mulaw", sample_rate=DEFAULT_SAMPLING_RATE),
+        )
+        # pipecat only types the pcm formats, but ElevenLabs accepts
+        # ulaw_8000 on the same websocket API
+        tts = WarmElevenLabsTTSService(
+            api_key=os.getenv("ELEVENLABS_API_KEY", ""),
+            voice_id=config.voice_id,
+            output_format="ulaw_8000",  # type: ignore
+        )
+    else:
+        stt = WarmDeepgramSTTService(api_key=os.getenv("DEEPGRAM_API_KEY", ""))
+        tts = WarmElevenLabsTTSService(
+            api_key=os.getenv("ELEVENLABS_API_KEY", ""),
+            voice_id=config.voice_id,
+        )
+
+    messages: List[ChatCompletionMessageParam] = [
+        {
+            "role": "system",
+            "content": config.prompt_premble.message
+            + "\n Your output will be converted to audio so don't include special characters in your answers.",
+        },
+    ]
+
+    context: OpenAILLMContext
+    if config.context_max_tokens is not None:
+        context = BoundedLLMContext(
+            messages,
+            summarize=openai_summarizer(os.getenv("OPENAI_API_KEY"), config.summary_model),
+            max_tokens=config.context_max_tokens,
+            keep_turns=config.context_keep_turns,
+        )
+    else:
+        context = OpenAILLMContext(messages)
+    return WarmPipeline(stt=stt, llm=llm, tts=tts, context=context, messages=messages)
@@ -0,0 +1,153 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict
+
+from loguru import logger
+
+from streaming_providers.pipecat.pipecat import PipecatStreamingConfig
+from streaming_providers.pipecat.warm_pipeline import WarmPipeline, create_warm_pipeline
+from telephony.utils.asyncio import asyncio_create_task
+
+# each warm pipeline holds a Deepgram and an ElevenLabs connection open
+DEFAULT_POOL_SIZE = int(os.getenv("WARM_PIPELINES_PER_ROUTE", "1"))
+# Twilio gives up ringing after 60 seconds by default
+DEFAULT_CALL_TTL_SECONDS = 90.0
+# pooled connections are recycled so they never go stale
+DEFAULT_MAX_AGE_SECONDS = 300.0
+SWEEP_INTERVAL_SECONDS = 5.0
+
+
+def config_key(config: PipecatStreamingConfig) -> str:
+    return hashlib.sha256(config.json().encode()).hexdigest()
+
+
+def _failed(task: asyncio.Task) -> bool:
+    return task.done() and (task.cancelled() or task.exception() is not None)
+
+
+@dataclass
+class _WarmEntry:
+    task: "asyncio.Task[WarmPipeline]"
+    expires_at: float
+
+
+class WarmPipelinePool:
+    """
+    Pipelines warmed ahead of the Twilio websocket. Outbound calls get one
+    keyed by conversation id as soon as the call is placed, which is closed
+    if the call hasn't connected within `call_ttl`. Inbound routes keep
+    `size` generic pipelines per config, replaced as they are taken and
+    recycled after `max_age`.
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        call_ttl: float = DEFAULT_CALL_TTL_SECONDS,
+        max_age: float = DEFAULT_MAX_AGE_SECONDS,
+    ):
+        self.size = size
+        self.call_ttl = call_ttl
+        self.max_age = max_age
+        self._calls: Dict[str, _WarmEntry] = {}
+        self._pools: Dict[str, Deque[_WarmEntry]] = {}
+        self._pool_configs: Dict[str, PipecatStreamingConfig] = {}
+        self._sweeper: asyncio.Task | None = None
+
+    def warm_call(self, conversation_id: str, config: PipecatStreamingConfig):
+        if conversation_id in self._calls:
+            return
+        logger.debug(f"Warming pipeline for {conversation_id}")
+        self._calls[conversation_id] = self._warm(config, self.call_ttl)
+        self._start_sweeper()
+
+    def fill(self, config: PipecatStreamingConfig):
+        key = config_key(config)
+        self._pool_configs[key] = config
+        pool = self._pools.setdefault(key, deque())
+        while len(pool) < self.size:
+            pool.append(self._warm(config, self.max_age))
+        self._start_sweeper()
+
+    def take(
+        self, conversation_id: str | None, config: PipecatStreamingConfig
+    ) -> "asyncio.Task[WarmPipeline] | None":
+        # may still be connecting; the provider awaits it when it starts
+        entry = self._calls.pop(conversation_id, None) if conversation_id else None
+        if entry is not None:
+            return entry.task
+
+        key = config_key(config)
+        pool = self._pools.get(key)
+        if not pool:
+            return None
+        entry = pool.popleft()
+        self.fill(self._pool_configs[key])
+        return entry.task
+
+    def evict(self, conversation_id: str):
+        entry = self._calls.pop(conversation_id, None)
+        if entry is not None:
+            logger.debug(f"Evicting warm pipeline for {conversation_id}")
+            asyncio_create_task(self._close(entry))
+
+    async def close(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        entries = list(self._calls.values())
+        for pool in self._pools.values():
+            entries.extend(pool)
+        self._calls.clear()
+        self._pools.clear()
+        await asyncio.gather(*(self._close(entry) for entry in entries))
+
+    def _warm(self, config: PipecatStreamingConfig, lifetime: float) -> _WarmEntry:
+        return _WarmEntry(
+            task=asyncio_create_task(self._connect(config)),
+            expires_at=time.monotonic() + lifetime,
+        )
+
+    async def _connect(self, config: PipecatStreamingConfig) -> WarmPipeline:
+        pipeline = create_warm_pipeline(config)
+        await pipeline.connect()
+        return pipeline
+
+    async def _close(self, entry: _WarmEntry):
+        # wait for a pipeline that is still connecting, so no socket leaks
+        try:
+            pipeline = await entry.task
+        except Exception:
+            return
+        await pipeline.close()
+
+    def _start_sweeper(self):
+        if self._sweeper is None:
+            self._sweeper = asyncio_create_task(self._sweep_task_handler())
+
+    async def _sweep_task_handler(self):
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+            self._sweep(time.monotonic())
+
+    def _sweep(self, now: float):
+        for conversation_id, entry in list(self._calls.items()):
+            if entry.expires_at <= now:
+                logger.debug(f"Warm pipeline for {conversation_id} was never connected")
+                self.evict(conversation_id)
+
+        for key, pool in self._pools.items():
+            stale = [
+                entry
+                for entry in pool
+                if entry.expires_at <= now or _failed(entry.task)
+            ]
+            for entry in stale:
+                pool.remove(entry)
+                asyncio_create_task(self._close(entry))
+            if stale:
+                self.fill(self._pool_configs[key])
@@ -0,0 +1,23 @@
+from typing import Dict
+
+from telephony.models.model import BaseModel
+
+
+class CampaignCallResult(BaseModel):
+    call_id: str
+    conversation_id: str | None = None
+    telephony_id: str | None = None
+    # why the call couldn't be placed; a result with neither a telephony_id
+    # nor an error was being placed when the dialer stopped
+    error: str | None = None
+
+
+class BaseProgressStore:
+    async def get_results(self, campaign_id: str) -> Dict[str, CampaignCallResult]:
+        raise NotImplementedError
+
+    async def save_result(self, campaign_id: str, result: CampaignCallResult):
+        raise NotImplementedError
+
+    async def clear(self, campaign_id: str):
+        raise NotImplementedError
@@ -0,0 +1,235 @@
+import asyncio
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Set
+
+import aiohttp
+from loguru import logger
+
+from streaming_providers.models import StreamingProviderConfig
+from telephony.campaign.base_progress_store import BaseProgressStore, CampaignCallResult
+from telephony.capacity_registry.base_capacity_registry import BaseCapacityRegistry
+from telephony.clients.twilio_client import TwilioClient, TwilioException
+from telephony.config_manager.base_config_manager import BaseConfigManager
+from telephony.models.model import BaseModel
+from telephony.models.telephony import TwilioConfig
+from telephony.outbound_call import DEFAULT_MAX_CONCURRENT_CALLS, OutboundCall
+from telephony.utils.asyncio import asyncio_create_task
+from telephony.utils.strings import create_conversation_id
+
+# Twilio's default limits: calls per second for an account, and for each
+# local number calls are placed from
+ACCOUNT_CPS = float(os.getenv("TWILIO_ACCOUNT_CPS", "1"))
+FROM_NUMBER_CPS = float(os.getenv("TWILIO_FROM_NUMBER_CPS", "1"))
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+# how often to check the capacity registry while no node has headroom
+CAPACITY_POLL_SECONDS = 1.0
+
+
+class TokenBucket:
+    # `rate` tokens a second, up to `burst` saved up
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+
+    def delay(self) -> float:
+        # seconds until a token is available
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+    def take(self):
+        self._tokens -= 1
+
+
+async def acquire_tokens(*buckets: TokenBucket):
+    # takes a token from every bucket at the same moment; taking them one at a
+    # time would let the wait for a later bucket bunch up requests that the
+    # earlier ones had spaced out
+    while True:
+        delay = max(bucket.delay() for bucket in buckets)
+        if delay <= 0:
+            for bucket in buckets:
+                bucket.take()
+            return
+        await asyncio.sleep(delay)
+
+
+class CampaignCall(BaseModel):
+    # identifies the call within its campaign, so a resumed campaign skips it
+    call_id: str
+    to_phone: str
+    from_phone: str
+    telephony_params: Optional[Dict[str, str]] = None
+    digits: Optional[str] = None
+
+
+@dataclass
+class CampaignStats:
+    placed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+
+
+class CampaignDialer:
+    """
+    Places a campaign's calls through OutboundCall as fast as Twilio allows:
+    each call waits for a token from its account's and its from-number's
+    bucket, at most `max_concurrent_calls` calls are being placed at once and,
+    with a capacity registry, a call is only placed once a node has headroom
+    to take it. Rate limited (429) and 5xx responses are retried with jittered
+    exponential backoff.
+
+    With a progress store, every call is recorded before it is placed and
+    again with its outcome, and a campaign that is run again skips the calls
+    it already has a record for, so no one is called twice.
+    """
+
+    def __init__(
+        self,
+        campaign_id: str,
+        base_url: str,
+        config_manager: BaseConfigManager,
+        twilio_config: TwilioConfig,
+        streaming_provider_config: StreamingProviderConfig,
+        progress_store: BaseProgressStore | None = None,
+        capacity_registry: BaseCapacityRegistry | None = None,
+        telephony_client: TwilioClient | None = None,
+        account_cps: float = ACCOUNT_CPS,
+        from_number_cps: float = FROM_NUMBER_CPS,
+        max_concurrent_calls: int = DEFAULT_MAX_CONCURRENT_CALLS,
+        max_attempts: int = MAX_ATTEMPTS,
+    ):
+        self.campaign_id = campaign_id
+        self.base_url = base_url
+        self.config_manager = config_manager
+        self.twilio_config = twilio_config
+        self.streaming_provider_config = streaming_provider_config
+        self.progress_store = progress_store
+        self.capacity_registry = capacity_registry
+        self.telephony_client = telephony_client or TwilioClient.for_config(
+            base_url=base_url, maybe_twilio_config=twilio_config
+        )
+        self.from_number_cps = from_number_cps
+        self.max_concurrent_calls = max_concurrent_calls
+        self.max_attempts = max_attempts
+        self.stats = CampaignStats()
+        self._account_bucket = TokenBucket(account_cps)
+        self._from_number_buckets: Dict[str, TokenBucket] = {}
+
+    async def run(self, calls: Iterable[CampaignCall]) -> CampaignStats:
+        done: Set[str] = set()
+        if self.progress_store is not None:
+            done = set(await self.progress_store.get_results(self.campaign_id))
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_calls)
+        tasks: Set[asyncio.Task] = set()
+        for call in calls:
+            if call.call_id in done:
+                self.stats.skipped += 1
+                continue
+            await semaphore.acquire()
+            task = asyncio_create_task(self._dial(call))
+            tasks.add(task)
+            task.add_done_callback(lambda task: (tasks.discard(task), semaphore.release()))
+        await asyncio.gather(*tasks)
+        logger.info(f"Campaign {self.campaign_id}: {self.stats}")
+        return self.stats
+
+    async def _dial(self, call: CampaignCall):
+        outbound_call = OutboundCall(
+            base_url=self.base_url,
+            to_phone=call.to_phone,
+            from_phone=call.from_phone,
+            config_manager=self.config_manager,
+            conversation_id=create_conversation_id("outbound"),
+            telephony_config=self.twilio_config,
+            streaming_provider_config=self.streaming_provider_config,
+            telephony_params=call.telephony_params,
+            digits=call.digits,
+            telephony_client=self.telephony_client,
+        )
+        result = CampaignCallResult(
+            call_id=call.call_id, conversation_id=outbound_call.conversation_id
+        )
+        await self._save_result(result)
+
+        for attempt in range(1, self.max_attempts + 1):
+            media_host = await self._wait_for_capacity()
+            await acquire_tokens(self._account_bucket, self._from_number_bucket(call.from_phone))
+            try:
+                await outbound_call.place_call(media_host)
+                break
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None or attempt == self.max_attempts:
+                    logger.error(f"Failed to place campaign call {call.call_id}: {e}")
+                    self.stats.failed += 1
+                    result.error = str(e)
+                    await self._save_result(result)
+                    return
+                self.stats.retries += 1
+                await asyncio.sleep(delay)
+
+        self.stats.placed += 1
+        result.telephony_id = outbound_call.telephony_id
+        try:
+            await self.config_manager.save_config(
+                outbound_call.conversation_id, outbound_call.create_call_config()
+            )
+        except Exception as e:
+            logger.error(f"Failed to save the config of campaign call {call.call_id}: {e}")
+            result.error = str(e)
+        await self._save_result(result)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float | None:
+        retry_after = None
+        if isinstance(error, TwilioException) and error.status is not None:
+            if error.status == 429:
+                self.stats.rate_limited += 1
+            elif error.status < 500:
+                return None
+            retry_after = error.retry_after
+        elif not isinstance(error, aiohttp.ClientConnectorError):
+            # a request that may have reached Twilio could have placed the call
+            return None
+        backoff = random.uniform(
+            0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+        )
+        return max(backoff, retry_after or 0.0)
+
+    async def _wait_for_capacity(self) -> str | None:
+        if self.capacity_registry is None:
+            return None
+        while True:
+            try:
+                host = await self.capacity_registry.pick_host()
+            except Exception as e:
+                # dial as if there was no registry rather than stall
+                logger.warning(f"Failed to read the capacity registry: {e}")
+                return None
+            if host is not None:
+                return host
+            await asyncio.sleep(CAPACITY_POLL_SECONDS)
+
+    def _from_number_bucket(self, from_phone: str) -> TokenBucket:
+        if from_phone not in self._from_number_buckets:
+            self._from_number_buckets[from_phone] = TokenBucket(self.from_number_cps)
+        return self._from_number_buckets[from_phone]
+
+    async def _save_result(self, result: CampaignCallResult):
+        if self.progress_store is None:
+            return
+        try:
+            await self.progress_store.save_result(self.campaign_id, result)
+        except Exception as e:
+            logger.error(f"Failed to save progress of campaign call {result.call_id}: {e}")
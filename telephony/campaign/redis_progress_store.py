@@ -0,0 +1,36 @@
+from typing import Dict
+
+from redis.asyncio import Redis
+
+from telephony.campaign.base_progress_store import BaseProgressStore, CampaignCallResult
+from telephony.utils.redis import initialize_redis
+
+PROGRESS_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+def progress_key(campaign_id: str) -> str:
+    return f"campaign:{campaign_id}:progress"
+
+
+class RedisProgressStore(BaseProgressStore):
+    # one hash per campaign, from call_id to its result
+    def __init__(self, redis: Redis | None = None):
+        self.redis: Redis = redis or initialize_redis()
+
+    async def get_results(self, campaign_id: str) -> Dict[str, CampaignCallResult]:
+        results = await self.redis.hgetall(progress_key(campaign_id))  # type: ignore
+        return {
+            (call_id.decode() if isinstance(call_id, bytes) else call_id): (
+                CampaignCallResult.parse_raw(result)
+            )
+            for call_id, result in results.items()
+        }
+
+    async def save_result(self, campaign_id: str, result: CampaignCallResult):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(progress_key(campaign_id), result.call_id, result.json())
+            pipe.expire(progress_key(campaign_id), PROGRESS_TTL_SECONDS)
+            await pipe.execute()
+
+    async def clear(self, campaign_id: str):
+        await self.redis.delete(progress_key(campaign_id))
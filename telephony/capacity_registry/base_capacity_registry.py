@@ -0,0 +1,101 @@
+import asyncio
+import time
+from typing import Dict, List
+
+from loguru import logger
+
+from telephony.models.model import BaseModel
+from telephony.server.admission import AdmissionController
+from telephony.utils.asyncio import asyncio_create_task
+
+HEARTBEAT_SECONDS = 2.0
+# a node that misses a few heartbeats drops out of the registry
+NODE_TTL_SECONDS = 3 * HEARTBEAT_SECONDS
+# picks within this window reuse one read of the registry
+NODES_CACHE_SECONDS = 0.5
+
+
+class NoCapacityError(RuntimeError):
+    pass
+
+
+class NodeCapacity(BaseModel):
+    # host of the node's media websocket, as used in wss:// stream urls
+    host: str
+    active_calls: int
+    headroom: int
+
+
+class BaseCapacityRegistry:
+    def __init__(self):
+        self._nodes: Dict[str, NodeCapacity] = {}
+        self._nodes_read_at = 0.0
+
+    async def publish(self, node: NodeCapacity):
+        raise NotImplementedError
+
+    async def remove(self, host: str):
+        raise NotImplementedError
+
+    async def get_nodes(self) -> List[NodeCapacity]:
+        raise NotImplementedError
+
+    async def pick_host(self) -> str | None:
+        # the node with the most headroom; a pick counts against it until the
+        # next read, so a burst between two heartbeats is spread out
+        now = time.monotonic()
+        if now - self._nodes_read_at > NODES_CACHE_SECONDS:
+            self._nodes = {node.host: node for node in await self.get_nodes()}
+            self._nodes_read_at = now
+        node = max(self._nodes.values(), key=lambda node: node.headroom, default=None)
+        if node is None or node.headroom <= 0:
+            return None
+        node.headroom -= 1
+        return node.host
+
+
+class CapacityHeartbeat:
+    """
+    Publishes this node's live calls and headroom, from its
+    AdmissionController, to the registry every HEARTBEAT_SECONDS.
+    """
+
+    def __init__(
+        self,
+        registry: BaseCapacityRegistry,
+        host: str,
+        admission_controller: AdmissionController,
+    ):
+        self.registry = registry
+        self.host = host
+        self.admission_controller = admission_controller
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio_create_task(self._heartbeat_task_handler())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        try:
+            await self.registry.remove(self.host)
+        except Exception as e:
+            logger.warning(f"Failed to remove {self.host} from the capacity registry: {e}")
+
+    def node(self) -> NodeCapacity:
+        stats = self.admission_controller.stats
+        return NodeCapacity(
+            host=self.host,
+            active_calls=stats.active_calls + stats.reserved_calls,
+            headroom=self.admission_controller.headroom,
+        )
+
+    async def _heartbeat_task_handler(self):
+        while True:
+            try:
+                await self.registry.publish(self.node())
+            except Exception as e:
+                logger.warning(f"Failed to publish capacity for {self.host}: {e}")
+            await asyncio.sleep(HEARTBEAT_SECONDS)
@@ -0,0 +1,50 @@
+from typing import List
+
+from redis.asyncio import Redis
+
+from telephony.capacity_registry.base_capacity_registry import (
+    NODE_TTL_SECONDS,
+    BaseCapacityRegistry,
+    NodeCapacity,
+)
+from telephony.utils.redis import initialize_redis
+
+HOSTS_KEY = "capacity:hosts"
+
+
+def node_key(host: str) -> str:
+    return f"capacity:node:{host}"
+
+
+class RedisCapacityRegistry(BaseCapacityRegistry):
+    # Each node's capacity is a key that expires unless it is refreshed by a
+    # heartbeat; HOSTS_KEY lists the nodes so they can be read in one MGET.
+    def __init__(self, redis: Redis | None = None, ttl_seconds: float = NODE_TTL_SECONDS):
+        super().__init__()
+        self.redis: Redis = redis or initialize_redis()
+        self.ttl_seconds = ttl_seconds
+
+    async def publish(self, node: NodeCapacity):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(node_key(node.host), node.json(), px=int(self.ttl_seconds * 1000))
+            pipe.sadd(HOSTS_KEY, node.host)
+            await pipe.execute()
+
+    async def remove(self, host: str):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.delete(node_key(host))
+            pipe.srem(HOSTS_KEY, host)
+            await pipe.execute()
+
+    async def get_nodes(self) -> List[NodeCapacity]:
+        hosts = sorted(
+            host.decode() if isinstance(host, bytes) else host
+            for host in await self.redis.smembers(HOSTS_KEY)  # type: ignore
+        )
+        if not hosts:
+            return []
+        values = await self.redis.mget([node_key(host) for host in hosts])
+        expired = [host for host, value in zip(hosts, values) if value is None]
+        if expired:
+            await self.redis.srem(HOSTS_KEY, *expired)  # type: ignore
+        return [NodeCapacity.parse_raw(value) for value in values if value is not None]
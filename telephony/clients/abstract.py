@@ -21,6 +21,7 @@ class AbstractTelephonyClient(ABC):
         record: bool = False,
         digits: Optional[str] = None,
         telephony_params: Optional[Dict[str, str]] = None,
+        media_host: Optional[str] = None,  # defaults to base_url
     ) -> str:  # returns identifier of the call on the telephony provider
         pass
 
@@ -1,5 +1,7 @@
 import os
-from typing import Dict, Optional
+from functools import lru_cache
+from xml.sax.saxutils import escape
+from typing import Dict, Optional, Tuple
 
 import aiohttp
 from loguru import logger
@@ -11,20 +13,66 @@ from fastapi import Response
 from telephony.utils.async_requestor import AsyncRequestor
 
 
+STATUS_CALLBACK_EVENTS = ("initiated", "ringing", "answered", "completed")
+# overridable to point the client at a local stand-in for the Twilio API
+TWILIO_API_BASE_URL = os.getenv("TWILIO_API_BASE_URL", "https://api.twilio.com")
+
+
+@lru_cache(maxsize=64)
+def connection_twiml_template(media_host: str) -> Tuple[bytes, bytes]:
+    # the TwiML around the conversation id, built once per media host
+    twiml = f"""
+<Response>
+  <Connect>
+    <Stream url="wss://{media_host}/connect_call/{{conversation_id}}" />
+  </Connect>
+</Response>
+"""
+    prefix, suffix = twiml.split("{conversation_id}")
+    return prefix.encode(), suffix.encode()
+
+
 class TwilioBadRequestException(ValueError):
     pass
 
 
 class TwilioException(ValueError):
-    pass
+    def __init__(
+        self, message: str, status: int | None = None, retry_after: float | None = None
+    ):
+        super().__init__(message)
+        self.status = status
+        # seconds, from the Retry-After header of a 429 or 503
+        self.retry_after = retry_after
 
 
 class TwilioClient(AbstractTelephonyClient):
+    _clients: Dict[Tuple[str, str, str, str], "TwilioClient"] = {}
+
+    @classmethod
+    def for_config(
+        cls,
+        base_url: str,
+        maybe_twilio_config: Optional[TwilioConfig] = None,
+        api_base_url: str = TWILIO_API_BASE_URL,
+    ) -> "TwilioClient":
+        # clients hold no per-call state, so one per account is shared
+        twilio_config = maybe_twilio_config or TwilioConfig(
+            account_sid=os.environ["TWILIO_ACCOUNT_SID"],
+            auth_token=os.environ["TWILIO_AUTH_TOKEN"],
+        )
+        key = (base_url, api_base_url, twilio_config.account_sid, twilio_config.auth_token)
+        if key not in cls._clients:
+            cls._clients[key] = cls(base_url, twilio_config, api_base_url)
+        return cls._clients[key]
+
     def __init__(
         self,
         base_url: str,
         maybe_twilio_config: Optional[TwilioConfig] = None,
+        api_base_url: str = TWILIO_API_BASE_URL,
     ):
+        self.api_base_url = api_base_url
         self.twilio_config = maybe_twilio_config or TwilioConfig(
             account_sid=os.environ["TWILIO_ACCOUNT_SID"],
             auth_token=os.environ["TWILIO_AUTH_TOKEN"],
@@ -33,6 +81,9 @@ class TwilioClient(AbstractTelephonyClient):
             login=self.twilio_config.account_sid,
             password=self.twilio_config.auth_token,
         )
+        self.calls_url = (
+            f"{api_base_url}/2010-04-01/Accounts/{self.twilio_config.account_sid}/Calls"
+        )
         super().__init__(base_url=base_url)
 
     def get_telephony_config(self):
@@ -46,27 +97,32 @@ class TwilioClient(AbstractTelephonyClient):
         record: bool = False,  # currently no-op
         digits: Optional[str] = None,  # currently no-op
         telephony_params: Optional[Dict[str, str]] = None,
+        media_host: Optional[str] = None,
     ) -> str:
-        twiml = self.get_connection_twiml(conversation_id=conversation_id).body.decode( # type: ignore
-            "utf-8"
-        )
+        media_host = media_host or self.base_url
+        twiml = self.get_connection_twiml(
+            conversation_id=conversation_id, media_host=media_host
+        ).body.decode("utf-8")  # type: ignore
         data = {
             "Twiml": twiml,
             "To": f"+{to_phone}",
             "From": f"+{from_phone}",
+            # lets the node taking the call warm its pipeline while it rings
+            "StatusCallback": f"https://{media_host}/twilio/call_status/{conversation_id}",
             **(telephony_params or {}),
         }
         if digits:
             data["SendDigits"] = digits
-        async with (
-            AsyncRequestor()
-            .get_session()
-            .post(
-                f"https://api.twilio.com/2010-04-01/Accounts/{self.twilio_config.account_sid}/Calls.json",
-                auth=self.auth,
-                data=data,
-            ) as response
-        ):
+        form = list(data.items()) + [
+            ("StatusCallbackEvent", event) for event in STATUS_CALLBACK_EVENTS
+        ]
+        async with AsyncRequestor().request(
+            "twilio.create_call",
+            "POST",
+            f"{self.calls_url}.json",
+            auth=self.auth,
+            data=form,
+        ) as response:
             if not response.ok:
                 if response.status == 400:
                     logger.warning(
@@ -76,35 +132,44 @@ class TwilioClient(AbstractTelephonyClient):
                         "Telephony provider rejected call; this is usually due to a bad/malformed number. "
                     )
                 else:
+                    retry_after = response.headers.get("Retry-After")
                     raise TwilioException(
-                        f"Twilio failed to create call: {response.status} {response.reason}"
+                        f"Twilio failed to create call: {response.status} {response.reason}",
+                        status=response.status,
+                        retry_after=(
+                            float(retry_after)
+                            if retry_after and retry_after.isdigit()
+                            else None
+                        ),
                     )
             response = await response.json()
             return response["sid"]
 
-    def get_connection_twiml(self, conversation_id: str):
-        twml = f"""
-<Response>
-  <Connect>
-    <Stream url="wss://{self.base_url}/connect_call/{conversation_id}" />
-  </Connect>
-</Response>
-"""
+    def get_connection_twiml(self, conversation_id: str, media_host: Optional[str] = None):
+        prefix, suffix = connection_twiml_template(media_host or self.base_url)
+        return Response(
+            prefix + conversation_id.encode() + suffix,
+            media_type="application/xml",
+        )
+
+    def get_overflow_twiml(self, overflow_url: str | None = None):
+        if overflow_url is not None:
+            verb = f"<Redirect>{escape(overflow_url)}</Redirect>"
+        else:
+            verb = '<Reject reason="busy" />'
         return Response(
-            twml,
+            f"<Response>{verb}</Response>",
             media_type="application/xml",
         )
 
     async def end_call(self, telephony_id: str) -> bool:
-        async with (
-            AsyncRequestor()
-            .get_session()
-            .post(
-                f"https://api.twilio.com/2010-04-01/Accounts/{self.twilio_config.account_sid}/Calls/{telephony_id}.json",
-                auth=self.auth,
-                data={"Status": "completed"},
-            ) as response
-        ):
+        async with AsyncRequestor().request(
+            "twilio.end_call",
+            "POST",
+            f"{self.calls_url}/{telephony_id}.json",
+            auth=self.auth,
+            data={"Status": "completed"},
+        ) as response:
             if not response.ok:
                 raise RuntimeError(
                     f"Failed to end call: {response.status} {response.reason}"
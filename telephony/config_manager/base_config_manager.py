@@ -1,9 +1,15 @@
 from enum import Enum
-from typing import Literal, Optional
+from typing import Dict, Iterable, Literal, Optional
 
 from telephony.models.telephony import BaseCallConfig
  
 class BaseConfigManager:
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
     async def save_config(self, conversation_id: str, config: BaseCallConfig):
         raise NotImplementedError
 
@@ -12,3 +18,19 @@ class BaseConfigManager:
 
     async def delete_config(self, conversation_id):
         raise NotImplementedError
+
+    async def save_configs(self, configs: Dict[str, BaseCallConfig]):
+        for conversation_id, config in configs.items():
+            await self.save_config(conversation_id, config)
+
+    async def get_configs(
+        self, conversation_ids: Iterable[str]
+    ) -> Dict[str, Optional[BaseCallConfig]]:
+        return {
+            conversation_id: await self.get_config(conversation_id)
+            for conversation_id in conversation_ids
+        }
+
+    async def delete_configs(self, conversation_ids: Iterable[str]):
+        for conversation_id in conversation_ids:
+            await self.delete_config(conversation_id)
@@ -0,0 +1,179 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+from redis.asyncio import Redis
+
+from telephony.config_manager.base_config_manager import BaseCallConfig
+from telephony.config_manager.redis_config_manager import RedisConfigManager
+from telephony.utils.asyncio import asyncio_create_task
+
+INVALIDATION_CHANNEL = "config:invalidate"
+CACHE_TTL_SECONDS = float(os.getenv("CONFIG_CACHE_TTL_SECONDS", "60"))
+CACHE_MAX_ENTRIES = int(os.getenv("CONFIG_CACHE_MAX_ENTRIES", "1000"))
+RESUBSCRIBE_SECONDS = 1.0
+
+
+class CachedRedisConfigManager(RedisConfigManager):
+    """
+    Keeps recently saved and read configs in process, in front of Redis.
+    Writes go through to Redis and are announced on INVALIDATION_CHANNEL so
+    other nodes drop their copy; an inbound call whose webhook and websocket
+    land on the same node reads its config without a Redis round trip.
+
+    Configs are only cached while the invalidation subscription is up, so a
+    node that can't hear other nodes' writes always reads from Redis. The
+    cached configs are shared, callers must not modify them.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = CACHE_TTL_SECONDS,
+        max_entries: int = CACHE_MAX_ENTRIES,
+    ):
+        super().__init__()
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.node_id = uuid.uuid4().hex
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[str, Tuple[float, BaseCallConfig]] = OrderedDict()
+        # bumped on every invalidation, so a read from Redis that raced with
+        # one isn't cached
+        self._generation = 0
+        self._subscribed = False
+        self._subscriber_task: asyncio.Task | None = None
+
+    async def start(self):
+        if self._subscriber_task is None:
+            self._subscriber_task = asyncio_create_task(self._subscriber_task_handler())
+
+    async def stop(self):
+        if self._subscriber_task is not None:
+            self._subscriber_task.cancel()
+            self._subscriber_task = None
+        self._set_subscribed(False)
+        logger.info(f"Config cache: {self.hits} hits, {self.misses} misses")
+
+    async def save_config(self, conversation_id: str, config: BaseCallConfig):
+        await super().save_config(conversation_id, config)
+        self._invalidate(conversation_id)
+        self._put(conversation_id, config, self._generation)
+        await self._publish_invalidation([conversation_id])
+
+    async def get_config(self, conversation_id) -> Optional[BaseCallConfig]:
+        config = self._cached(conversation_id)
+        if config is not None:
+            return config
+        generation = self._generation
+        config = await super().get_config(conversation_id)
+        if config is not None:
+            self._put(conversation_id, config, generation)
+        return config
+
+    async def delete_config(self, conversation_id):
+        await super().delete_config(conversation_id)
+        self._invalidate(conversation_id)
+        await self._publish_invalidation([conversation_id])
+
+    async def save_configs(self, configs: Dict[str, BaseCallConfig]):
+        await super().save_configs(configs)
+        for conversation_id in configs:
+            self._invalidate(conversation_id)
+        for conversation_id, config in configs.items():
+            self._put(conversation_id, config, self._generation)
+        await self._publish_invalidation(list(configs))
+
+    async def get_configs(
+        self, conversation_ids: Iterable[str]
+    ) -> Dict[str, Optional[BaseCallConfig]]:
+        configs = {
+            conversation_id: self._cached(conversation_id)
+            for conversation_id in conversation_ids
+        }
+        missing = [
+            conversation_id for conversation_id, config in configs.items() if config is None
+        ]
+        if missing:
+            generation = self._generation
+            for conversation_id, config in (await super().get_configs(missing)).items():
+                configs[conversation_id] = config
+                if config is not None:
+                    self._put(conversation_id, config, generation)
+        return configs
+
+    async def delete_configs(self, conversation_ids: Iterable[str]):
+        conversation_ids = list(conversation_ids)
+        await super().delete_configs(conversation_ids)
+        for conversation_id in conversation_ids:
+            self._invalidate(conversation_id)
+        await self._publish_invalidation(conversation_ids)
+
+    def _cached(self, conversation_id: str) -> BaseCallConfig | None:
+        entry = self._cache.get(conversation_id)
+        if entry is not None:
+            expires_at, config = entry
+            if expires_at > time.monotonic():
+                self._cache.move_to_end(conversation_id)
+                self.hits += 1
+                return config
+            del self._cache[conversation_id]
+        self.misses += 1
+        return None
+
+    def _put(self, conversation_id: str, config: BaseCallConfig, generation: int):
+        if not self._subscribed or generation != self._generation:
+            return
+        self._cache[conversation_id] = (time.monotonic() + self.ttl_seconds, config)
+        self._cache.move_to_end(conversation_id)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def _invalidate(self, conversation_id: str):
+        self._generation += 1
+        self._cache.pop(conversation_id, None)
+
+    def _set_subscribed(self, subscribed: bool):
+        # invalidations may have been missed while unsubscribed
+        self._generation += 1
+        self._cache.clear()
+        self._subscribed = subscribed
+
+    async def _publish_invalidation(self, conversation_ids: List[str]):
+        # one message per batch; conversation ids never contain spaces
+        try:
+            await self.redis.publish(
+                INVALIDATION_CHANNEL, f"{self.node_id}:{' '.join(conversation_ids)}"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish invalidation for {len(conversation_ids)} configs: {e}")
+
+    async def _subscriber_task_handler(self):
+        redis: Redis = self.redis
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                self._set_subscribed(True)
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    data = message["data"]
+                    if isinstance(data, bytes):
+                        data = data.decode()
+                    node_id, _, conversation_ids = data.partition(":")
+                    if node_id != self.node_id:
+                        for conversation_id in conversation_ids.split(" "):
+                            self._invalidate(conversation_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Config invalidation subscription failed: {e}")
+            finally:
+                self._set_subscribed(False)
+                await pubsub.aclose()
+            await asyncio.sleep(RESUBSCRIBE_SECONDS)
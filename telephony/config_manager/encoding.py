@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import zlib
+from typing import Dict
+
+from streaming_providers.models import StreamingProviderConfig
+from telephony.models.telephony import BaseCallConfig
+
+# Stored values start with MAGIC, a format version and a flags byte. Values
+# written before this format are plain JSON, which always starts with "{".
+MAGIC = b"\xc1"
+VERSION = 1
+FLAG_ZLIB = 0x01
+HEADER_SIZE = 3
+
+# a call config stored without its streaming provider config names it by
+# the hash of its content under this key instead
+PROVIDER_CONFIG_HASH_KEY = "streaming_provider_config_hash"
+
+COMPRESS_THRESHOLD_BYTES = int(os.getenv("CONFIG_COMPRESS_THRESHOLD_BYTES", "512"))
+COMPRESSION_LEVEL = 6
+
+
+class ConfigEncodingError(ValueError):
+    pass
+
+
+def provider_config_hash(config: StreamingProviderConfig) -> str:
+    payload = json.dumps(config.dict(), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def encode_config(
+    config: BaseCallConfig,
+    compress_threshold: int = COMPRESS_THRESHOLD_BYTES,
+    provider_config_hash: str | None = None,
+) -> bytes:
+    # defaults are left out, they are filled back in when the config is parsed
+    if provider_config_hash is None:
+        payload = config.dict(exclude_defaults=True)
+    else:
+        payload = config.dict(exclude_defaults=True, exclude={"streaming_provider_config"})
+        payload[PROVIDER_CONFIG_HASH_KEY] = provider_config_hash
+    return _encode_payload(payload, compress_threshold)
+
+
+def encode_provider_config(
+    config: StreamingProviderConfig, compress_threshold: int = COMPRESS_THRESHOLD_BYTES
+) -> bytes:
+    return _encode_payload(config.dict(exclude_defaults=True), compress_threshold)
+
+
+def decode_config(data: bytes | str) -> BaseCallConfig:
+    payload = load_payload(data)
+    if PROVIDER_CONFIG_HASH_KEY in payload:
+        raise ConfigEncodingError("Call config refers to a stored streaming provider config")
+    return BaseCallConfig.parse_obj(payload)
+
+
+def decode_provider_config(data: bytes | str) -> StreamingProviderConfig:
+    return StreamingProviderConfig.parse_obj(load_payload(data))
+
+
+def load_payload(data: bytes | str) -> Dict:
+    if isinstance(data, str):
+        data = data.encode()
+    if not data.startswith(MAGIC):
+        # written by an older version as plain JSON
+        return json.loads(data)
+
+    if len(data) < HEADER_SIZE:
+        raise ConfigEncodingError("Truncated call config")
+    version, flags = data[1], data[2]
+    if version != VERSION:
+        raise ConfigEncodingError(f"Unknown call config encoding version {version}")
+    payload = data[HEADER_SIZE:]
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    return json.loads(payload)
+
+
+def _encode_payload(payload: Dict, compress_threshold: int) -> bytes:
+    encoded = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+    flags = 0
+    if len(encoded) > compress_threshold:
+        compressed = zlib.compress(encoded, COMPRESSION_LEVEL)
+        if len(compressed) < len(encoded):
+            encoded = compressed
+            flags |= FLAG_ZLIB
+    return MAGIC + bytes((VERSION, flags)) + encoded
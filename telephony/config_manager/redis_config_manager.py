@@ -1,33 +1,177 @@
 import json
-from typing import Optional
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from loguru import logger
 from redis.asyncio import Redis
 
 from telephony.config_manager.base_config_manager import BaseCallConfig, BaseConfigManager
+from streaming_providers.models import StreamingProviderConfig
+from telephony.config_manager.encoding import (
+    PROVIDER_CONFIG_HASH_KEY,
+    decode_provider_config,
+    encode_config,
+    encode_provider_config,
+    load_payload,
+    provider_config_hash,
+)
 from telephony.utils.redis import initialize_redis
 
+CONFIG_TTL_SECONDS = 60 * 60 * 24
+# keys per pipeline or MGET, so one huge batch doesn't hold up the connection
+BATCH_SIZE = 500
+# distinct streaming provider configs kept in process
+PROVIDER_CONFIG_CACHE_SIZE = 256
+
+
+def _chunks(items: Iterable, size: int = BATCH_SIZE) -> Iterable[List]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def provider_config_key(config_hash: str) -> str:
+    return f"provider_config:{config_hash}"
+
 
 class RedisConfigManager(BaseConfigManager):
-    def __init__(self):
-        self.redis: Redis = initialize_redis()
+    """
+    Stores call configs in Redis. A call config's streaming provider config,
+    with its prompt, is usually the same for every call of a route or a
+    campaign, so it is stored once under the hash of its content and the call
+    config refers to it. Provider configs never change under a hash, so
+    recently used ones are kept in process without invalidation.
+    """
 
-    async def _set_with_one_day_expiration(self, *args, **kwargs):
-        ONE_DAY_SECONDS = 60 * 60 * 24
-        return await self.redis.set(*args, **{**kwargs, "ex": ONE_DAY_SECONDS})
+    def __init__(self, provider_cache_size: int = PROVIDER_CONFIG_CACHE_SIZE):
+        # configs are stored in a binary encoding
+        self.redis: Redis = initialize_redis(decode_responses=False)
+        self.provider_cache_size = provider_cache_size
+        self._provider_configs: OrderedDict[str, StreamingProviderConfig] = OrderedDict()
+        # hashes of the provider config objects recently saved, by id; the
+        # calls of an inbound route all share their route's provider config
+        self._provider_config_hashes: OrderedDict[
+            int, Tuple[StreamingProviderConfig, str]
+        ] = OrderedDict()
 
     async def save_config(self, conversation_id: str, config: BaseCallConfig):
         logger.debug(f"Saving config for {conversation_id}")
-        await self._set_with_one_day_expiration(conversation_id, config.json())
+        await self._save({conversation_id: config})
 
     async def get_config(self, conversation_id) -> Optional[BaseCallConfig]:
         logger.debug(f"Getting config for {conversation_id}")
         raw_config = await self.redis.get(conversation_id)  # type: ignore
-        if raw_config:
-            # TODO: fix parsing issue with v2 pydantic
-            return BaseCallConfig.parse_raw(raw_config)
-        return None
+        return (await self._decode([raw_config]))[0]
 
     async def delete_config(self, conversation_id):
         logger.debug(f"Deleting config for {conversation_id}")
         await self.redis.delete(conversation_id)
+
+    async def save_configs(self, configs: Dict[str, BaseCallConfig]):
+        logger.debug(f"Saving {len(configs)} configs")
+        for chunk in _chunks(configs.items()):
+            await self._save(dict(chunk))
+
+    async def get_configs(
+        self, conversation_ids: Iterable[str]
+    ) -> Dict[str, Optional[BaseCallConfig]]:
+        configs: Dict[str, Optional[BaseCallConfig]] = {}
+        for chunk in _chunks(conversation_ids):
+            logger.debug(f"Getting {len(chunk)} configs")
+            decoded = await self._decode(await self.redis.mget(chunk))
+            configs.update(zip(chunk, decoded))
+        return configs
+
+    async def delete_configs(self, conversation_ids: Iterable[str]):
+        for chunk in _chunks(conversation_ids):
+            logger.debug(f"Deleting {len(chunk)} configs")
+            await self.redis.delete(*chunk)
+
+    async def _save(self, configs: Dict[str, BaseCallConfig]):
+        provider_configs: Dict[str, StreamingProviderConfig] = {}
+        encoded: Dict[str, bytes] = {}
+        for conversation_id, config in configs.items():
+            config_hash = self._provider_config_hash(config.streaming_provider_config)
+            provider_configs[config_hash] = config.streaming_provider_config
+            encoded[conversation_id] = encode_config(config, provider_config_hash=config_hash)
+
+        # provider configs are written ahead of the call configs that refer to
+        # them and live at least as long; one known to be stored only has its
+        # expiry extended. MSET can't expire keys, so each key is its own SET.
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for config_hash, provider_config in provider_configs.items():
+                if config_hash in self._provider_configs:
+                    pipe.expire(provider_config_key(config_hash), CONFIG_TTL_SECONDS)
+                else:
+                    pipe.set(
+                        provider_config_key(config_hash),
+                        encode_provider_config(provider_config),
+                        ex=CONFIG_TTL_SECONDS,
+                    )
+            for conversation_id, raw_config in encoded.items():
+                pipe.set(conversation_id, raw_config, ex=CONFIG_TTL_SECONDS)
+            results = await pipe.execute()
+
+        for (config_hash, provider_config), stored in zip(provider_configs.items(), results):
+            if not stored:
+                # evicted from Redis while it was cached here
+                await self.redis.set(
+                    provider_config_key(config_hash),
+                    encode_provider_config(provider_config),
+                    ex=CONFIG_TTL_SECONDS,
+                )
+            self._cache_provider_config(config_hash, provider_config)
+
+    async def _decode(self, raw_configs: List[bytes | None]) -> List[Optional[BaseCallConfig]]:
+        payloads = [load_payload(raw_config) if raw_config else None for raw_config in raw_configs]
+        missing = {
+            payload[PROVIDER_CONFIG_HASH_KEY]
+            for payload in payloads
+            if payload is not None
+            and PROVIDER_CONFIG_HASH_KEY in payload
+            and payload[PROVIDER_CONFIG_HASH_KEY] not in self._provider_configs
+        }
+        if missing:
+            hashes = list(missing)
+            raw_provider_configs = await self.redis.mget(
+                [provider_config_key(config_hash) for config_hash in hashes]
+            )
+            for config_hash, raw_provider_config in zip(hashes, raw_provider_configs):
+                if raw_provider_config:
+                    self._cache_provider_config(
+                        config_hash, decode_provider_config(raw_provider_config)
+                    )
+
+        configs: List[Optional[BaseCallConfig]] = []
+        for payload in payloads:
+            if payload is not None and PROVIDER_CONFIG_HASH_KEY in payload:
+                config_hash = payload.pop(PROVIDER_CONFIG_HASH_KEY)
+                provider_config = self._provider_configs.get(config_hash)
+                if provider_config is None:
+                    logger.error(f"Missing streaming provider config {config_hash}")
+                    configs.append(None)
+                    continue
+                self._provider_configs.move_to_end(config_hash)
+                payload["streaming_provider_config"] = provider_config
+            configs.append(BaseCallConfig.parse_obj(payload) if payload is not None else None)
+        return configs
+
+    def _provider_config_hash(self, config: StreamingProviderConfig) -> str:
+        # the config is kept alongside its hash so its id isn't reused while
+        # it is cached; configs aren't modified after they are first saved
+        cached = self._provider_config_hashes.get(id(config))
+        if cached is not None and cached[0] is config:
+            self._provider_config_hashes.move_to_end(id(config))
+            return cached[1]
+        config_hash = provider_config_hash(config)
+        self._provider_config_hashes[id(config)] = (config, config_hash)
+        while len(self._provider_config_hashes) > self.provider_cache_size:
+            self._provider_config_hashes.popitem(last=False)
+        return config_hash
+
+    def _cache_provider_config(self, config_hash: str, config: StreamingProviderConfig):
+        self._provider_configs[config_hash] = config
+        self._provider_configs.move_to_end(config_hash)
+        while len(self._provider_configs) > self.provider_cache_size:
+            self._provider_configs.popitem(last=False)
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional
+from typing import Dict, Optional
 
 from telephony.models.model import BaseModel
 
@@ -21,6 +21,8 @@ class EventType(str, Enum):
     PHONE_CALL_DID_NOT_CONNECT = "event_phone_call_did_not_connect"
     RECORDING = "event_recording"
     ACTION = "event_action"
+    TURN_LATENCY = "event_turn_latency"
+    CALL_LATENCY = "event_call_latency"
 
 
 class Event(BaseModel):
@@ -53,3 +55,15 @@ class ActionEvent(Event):
     event_type: EventType = EventType.ACTION
     action_input: Optional[dict] = None
     action_output: Optional[dict] = None
+
+
+class TurnLatencyEvent(Event):
+    event_type: EventType = EventType.TURN_LATENCY
+    # milliseconds from the end of the caller's speech to each stage
+    stages_ms: Dict[str, float]
+
+
+class CallLatencyEvent(Event):
+    event_type: EventType = EventType.CALL_LATENCY
+    # p50/p95/p99 and count per stage over the whole call
+    stages: Dict[str, Dict[str, float]]
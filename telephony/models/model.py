@@ -1,46 +1,41 @@
-
-from typing import Any, List, Literal, Tuple
+from typing import Any, Dict, List, Literal, Tuple, Type
 
 from pydantic.v1 import BaseModel as Pydantic1BaseModel
 
 PhoneCallDirection = Literal["inbound", "outbound"]
 
 class BaseModel(Pydantic1BaseModel):
-    def __init__(self, **data):
-        for key, value in data.items():
-            if isinstance(value, dict):
-                if (
-                    "type" in value and key != "action_trigger"
-                ):  # TODO: this is a quick workaround until we get a vocode object version of action trigger (ajay has approved it)
-                    data[key] = TypedModel.parse_obj(value)
-            if isinstance(value, list):
-                for i, v in enumerate(value):
-                    if isinstance(v, dict):
-                        if "type" in v:
-                            value[i] = TypedModel.parse_obj(v)
-        super().__init__(**data)
+    pass
 
 
 # Adapted from https://github.com/pydantic/pydantic/discussions/3091
 class TypedModel(BaseModel):
     _subtypes_: List[Tuple[Any, Any]] = []
+    # indexes over _subtypes_; the first class registered for a type or a
+    # class name wins, as it did when _subtypes_ was scanned
+    _classes_by_type_: Dict[Any, Type["TypedModel"]] = {}
+    _types_by_class_name_: Dict[str, Any] = {}
+    _type_: Any = None
 
     def __init_subclass__(cls, type=None):  # type: ignore
         cls._subtypes_.append((type, cls))
+        cls._classes_by_type_.setdefault(type, cls)
+        cls._types_by_class_name_.setdefault(cls.__name__, type)
+        cls._type_ = type
 
     @classmethod
     def get_cls(_cls, type):
-        for t, cls in _cls._subtypes_:
-            if t == type:
-                return cls
-        raise ValueError(f"Unknown type {type}")
+        try:
+            return _cls._classes_by_type_[type]
+        except (KeyError, TypeError):
+            raise ValueError(f"Unknown type {type}")
 
     @classmethod
     def get_type(_cls, cls_name):
-        for t, cls in _cls._subtypes_:
-            if cls.__name__ == cls_name:
-                return t
-        raise ValueError(f"Unknown class {cls_name}")
+        try:
+            return _cls._types_by_class_name_[cls_name]
+        except KeyError:
+            raise ValueError(f"Unknown class {cls_name}")
 
     @classmethod
     def parse_obj(cls, obj):
@@ -53,10 +48,21 @@ class TypedModel(BaseModel):
             raise ValueError(f"Unknown type {data_type}")
         return sub(**obj)
 
+    @classmethod
+    def validate(cls, value):
+        # pydantic validates a nested TypedModel field through here, so a
+        # nested dict is built once, as the subclass its "type" names
+        if isinstance(value, dict) and "type" in value:
+            sub = cls.get_cls(value["type"])
+            if not issubclass(sub, cls):
+                raise TypeError(f"{sub.__name__} is not a {cls.__name__}")
+            return sub(**value)
+        return super().validate(value)
+
     def _iter(self, **kwargs): # type: ignore
-        yield "type", self.get_type(self.__class__.__name__)
+        yield "type", self._type_
         yield from super()._iter(**kwargs)
 
     @property
     def type(self):
-        return self.get_type(self.__class__.__name__)
+        return self._type_
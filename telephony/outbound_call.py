@@ -1,16 +1,28 @@
-from typing import Dict, Optional
+import asyncio
+import os
+from typing import Dict, List, Optional, Tuple
 import typing
 
 from loguru import logger
 
 from streaming_providers.models import StreamingProviderConfig
+from telephony.capacity_registry.base_capacity_registry import (
+    BaseCapacityRegistry,
+    NoCapacityError,
+)
 from telephony.clients.abstract import AbstractTelephonyClient
 from telephony.clients.twilio_client import TwilioClient
 from telephony.config_manager.base_config_manager import (
     BaseConfigManager,
 )
-from telephony.models.telephony import TwilioCallConfig, TwilioConfig
+from telephony.models.telephony import BaseCallConfig, TwilioCallConfig, TwilioConfig
 from telephony.models.telephony import TelephonyConfig
+from telephony.utils.asyncio import asyncio_create_task
+
+# calls start_batch creates with the telephony provider at once
+DEFAULT_MAX_CONCURRENT_CALLS = int(os.getenv("OUTBOUND_MAX_CONCURRENT_CALLS", "10"))
+# how long start_batch collects the configs of placed calls into one save
+CONFIG_FLUSH_SECONDS = 0.005
 
 
 class OutboundCall:
@@ -28,6 +40,8 @@ class OutboundCall:
         digits: Optional[
             str
         ] = None,  # Keys to press when the call connects, see send_digits https://www.twilio.com/docs/voice/api/call-resource#create-a-call-resource
+        capacity_registry: Optional[BaseCapacityRegistry] = None,
+        telephony_client: Optional[AbstractTelephonyClient] = None,
     ):
         self.base_url = base_url
         self.to_phone = to_phone
@@ -36,21 +50,31 @@ class OutboundCall:
         self.conversation_id = conversation_id
         self.telephony_config = telephony_config
         self.telephony_params = telephony_params or {}
-        self.telephony_client = self.create_telephony_client()
+        self.telephony_client = telephony_client or self.create_telephony_client()
         self.sentry_tags = sentry_tags
         self.digits = digits
         self.streaming_provider_config = streaming_provider_config
+        self.capacity_registry = capacity_registry
 
     def create_telephony_client(self) -> AbstractTelephonyClient:
         if isinstance(self.telephony_config, TwilioConfig):
-            return TwilioClient(
+            return TwilioClient.for_config(
                 base_url=self.base_url, maybe_twilio_config=self.telephony_config
             )
         else:
             raise ValueError("Unsupported telephony configuration")
 
     async def start(self):
+        await self.place_call()
+        await self.config_manager.save_config(
+            conversation_id=self.conversation_id,
+            config=self.create_call_config(),
+        )
+
+    async def place_call(self, media_host: Optional[str] = None):
         logger.debug("Starting outbound call")
+        if media_host is None and self.capacity_registry is not None:
+            media_host = await self.pick_media_host()
         self.telephony_id = await self.telephony_client.create_call(
             conversation_id=self.conversation_id,
             to_phone=self.to_phone,
@@ -58,9 +82,25 @@ class OutboundCall:
             record=self.telephony_client.get_telephony_config().record,  # note twilio does not use this
             telephony_params=self.telephony_params,
             digits=self.digits,
+            media_host=media_host,
         )
+
+    async def pick_media_host(self) -> str | None:
+        # like the inbound route: no call when no node has headroom, and the
+        # call's own base_url when the registry can't be read
+        assert self.capacity_registry is not None
+        try:
+            media_host = await self.capacity_registry.pick_host()
+        except Exception as e:
+            logger.warning(f"Failed to read the capacity registry: {e}")
+            return None
+        if media_host is None:
+            raise NoCapacityError(f"No node has capacity for call {self.conversation_id}")
+        return media_host
+
+    def create_call_config(self) -> BaseCallConfig:
         if isinstance(self.telephony_client, TwilioClient):
-            call_config = TwilioCallConfig(
+            return TwilioCallConfig(
                 twilio_config=self.telephony_client.twilio_config,
                 twilio_sid=self.telephony_id,
                 from_phone=self.from_phone,
@@ -72,10 +112,57 @@ class OutboundCall:
             )
         else:
             raise ValueError("Unknown telephony client")
-        await self.config_manager.save_config(
-            conversation_id=self.conversation_id,
-            config=call_config,
-        )
+
+    @staticmethod
+    async def start_batch(
+        calls: List["OutboundCall"],
+        max_concurrent_calls: int = DEFAULT_MAX_CONCURRENT_CALLS,
+    ) -> List[Optional[BaseException]]:
+        """
+        Places the calls, at most max_concurrent_calls at a time. Each call's
+        config is saved as soon as the call is placed, batched per config
+        manager with the configs of calls placed within CONFIG_FLUSH_SECONDS
+        of it, so a call can't be answered long before its config exists.
+        Returns the error for each call that failed to be placed or whose
+        config couldn't be saved, or None.
+        """
+        semaphore = asyncio.Semaphore(max_concurrent_calls)
+        # configs waiting to be saved and the future of their save, per config manager
+        batches: Dict[int, Tuple[Dict[str, BaseCallConfig], asyncio.Future]] = {}
+
+        async def flush(config_manager: BaseConfigManager):
+            await asyncio.sleep(CONFIG_FLUSH_SECONDS)
+            configs, saved = batches.pop(id(config_manager))
+            try:
+                await config_manager.save_configs(configs)
+                saved.set_result(None)
+            except Exception as e:
+                saved.set_exception(e)
+
+        async def save_config(call: OutboundCall):
+            key = id(call.config_manager)
+            if key not in batches:
+                batches[key] = ({}, asyncio.get_running_loop().create_future())
+                asyncio_create_task(flush(call.config_manager))
+            configs, saved = batches[key]
+            configs[call.conversation_id] = call.create_call_config()
+            await asyncio.shield(saved)
+
+        async def start(call: OutboundCall) -> Optional[BaseException]:
+            try:
+                async with semaphore:
+                    await call.place_call()
+            except Exception as e:
+                logger.error(f"Failed to place call {call.conversation_id}: {e}")
+                return e
+            try:
+                await save_config(call)
+            except Exception as e:
+                logger.error(f"Failed to save the config of call {call.conversation_id}: {e}")
+                return e
+            return None
+
+        return list(await asyncio.gather(*(start(call) for call in calls)))
 
     async def end(self):
         return await self.telephony_client.end_call(self.telephony_id)
@@ -0,0 +1,150 @@
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, Iterator
+
+from loguru import logger
+
+from telephony.utils.asyncio import asyncio_create_task
+
+LAG_SAMPLE_INTERVAL_SECONDS = 0.1
+CPU_SAMPLE_INTERVAL_SECONDS = 1.0
+# weight of a lower sample in the smoothed event loop lag
+LAG_SMOOTHING = 0.3
+# an inbound call is counted from its webhook until its websocket connects
+RESERVATION_SECONDS = 15.0
+
+
+class RejectReason(str, Enum):
+    ACTIVE_CALLS = "active_calls"
+    LOOP_LAG = "loop_lag"
+    CPU = "cpu"
+
+
+@dataclass
+class AdmissionLimits:
+    max_active_calls: int = int(os.getenv("ADMISSION_MAX_CALLS", "50"))
+    max_loop_lag_ms: float = float(os.getenv("ADMISSION_MAX_LOOP_LAG_MS", "40"))
+    # CPU time of the event loop's thread as a fraction of one core; the
+    # loop can't use more than one core however many the host has
+    max_cpu: float = float(os.getenv("ADMISSION_MAX_CPU", "0.85"))
+
+
+@dataclass
+class AdmissionStats:
+    active_calls: int = 0
+    reserved_calls: int = 0
+    loop_lag_ms: float = 0.0
+    cpu: float = 0.0
+    admitted: int = 0
+    rejected: Dict[RejectReason, int] = field(
+        default_factory=lambda: {reason: 0 for reason in RejectReason}
+    )
+
+
+class AdmissionController:
+    """
+    Decides whether this worker takes another call. A call is refused once
+    the worker has `max_active_calls` calls (counting inbound calls that were
+    accepted but haven't connected yet), or while the smoothed event loop lag
+    or the event loop's CPU is over its limit, so a burst is turned away
+    instead of degrading the audio of every call already on the worker.
+    """
+
+    def __init__(self, limits: AdmissionLimits | None = None):
+        self.limits = limits or AdmissionLimits()
+        self.stats = AdmissionStats()
+        self._reservations: Dict[str, float] = {}
+        self._monitor_task: asyncio.Task | None = None
+
+    def start(self):
+        if self._monitor_task is None:
+            self._monitor_task = asyncio_create_task(self._monitor_task_handler())
+
+    async def stop(self):
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            self._monitor_task = None
+
+    @property
+    def headroom(self) -> int:
+        if self.overloaded() is not None:
+            return 0
+        return max(0, self.limits.max_active_calls - self._load())
+
+    def overloaded(self) -> RejectReason | None:
+        if self._load() >= self.limits.max_active_calls:
+            return RejectReason.ACTIVE_CALLS
+        if self.stats.loop_lag_ms > self.limits.max_loop_lag_ms:
+            return RejectReason.LOOP_LAG
+        if self.stats.cpu > self.limits.max_cpu:
+            return RejectReason.CPU
+        return None
+
+    def reserve(self, conversation_id: str) -> bool:
+        # for inbound webhooks, which admit a call before its websocket exists
+        if not self._admit(conversation_id):
+            return False
+        self._reservations[conversation_id] = time.monotonic() + RESERVATION_SECONDS
+        self.stats.reserved_calls = len(self._reservations)
+        return True
+
+    def admit_call(self, conversation_id: str) -> bool:
+        # a reserved call was already admitted by its webhook
+        if self._reservations.pop(conversation_id, None) is not None:
+            self.stats.reserved_calls = len(self._reservations)
+            return True
+        return self._admit(conversation_id)
+
+    @contextmanager
+    def track_call(self) -> Iterator[None]:
+        self.stats.active_calls += 1
+        try:
+            yield
+        finally:
+            self.stats.active_calls -= 1
+
+    def _admit(self, conversation_id: str) -> bool:
+        self._expire_reservations()
+        reason = self.overloaded()
+        if reason is not None:
+            self.stats.rejected[reason] += 1
+            logger.warning(f"Refusing call {conversation_id}: {reason.value} over limit")
+            return False
+        self.stats.admitted += 1
+        return True
+
+    def _load(self) -> int:
+        return self.stats.active_calls + len(self._reservations)
+
+    def _expire_reservations(self):
+        # every reservation lasts as long, so they expire in insertion order
+        now = time.monotonic()
+        while self._reservations:
+            conversation_id = next(iter(self._reservations))
+            if self._reservations[conversation_id] > now:
+                break
+            del self._reservations[conversation_id]
+        self.stats.reserved_calls = len(self._reservations)
+
+    async def _monitor_task_handler(self):
+        # runs on the event loop's thread, so this is that thread's CPU time
+        cpu_started, cpu_wall_started = time.thread_time(), time.monotonic()
+        while True:
+            expected = time.monotonic() + LAG_SAMPLE_INTERVAL_SECONDS
+            await asyncio.sleep(LAG_SAMPLE_INTERVAL_SECONDS)
+            now = time.monotonic()
+            lag_ms = max(0.0, now - expected) * 1000
+            if lag_ms >= self.stats.loop_lag_ms:
+                # react to a stall at once, recover gradually
+                self.stats.loop_lag_ms = lag_ms
+            else:
+                self.stats.loop_lag_ms += LAG_SMOOTHING * (lag_ms - self.stats.loop_lag_ms)
+
+            if now - cpu_wall_started >= CPU_SAMPLE_INTERVAL_SECONDS:
+                cpu = time.thread_time()
+                self.stats.cpu = (cpu - cpu_started) / (now - cpu_wall_started)
+                cpu_started, cpu_wall_started = cpu, now
@@ -57,4 +57,5 @@ class AbstractPhoneConversation:
 
     async def terminate(self):
         logger.warning(f"TODO: Terminating  call: {self.conversation_id}")
+        await self.output_device.stop()
         self.events_manager.publish_event(PhoneCallEndedEvent(conversation_id=self.conversation_id))
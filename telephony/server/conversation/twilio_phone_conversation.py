@@ -1,9 +1,7 @@
-import json
 from enum import Enum
 from typing import Optional
 
 from fastapi import WebSocket
-from loguru import logger
 
 from streaming_providers.base import BaseStreamingProvider
 from telephony.clients.twilio_client import TwilioClient
@@ -14,6 +12,7 @@ from telephony.server.conversation.abstract_phone_conversation import (
     AbstractPhoneConversation,
 )
 from telephony.server.output_devices.abstract_output_device import AbstractOutputDevice
+from telephony.utils.asyncio import asyncio_create_task
 from telephony.utils.events_manager import EventsManager
 from telephony.models.telephony import PhoneCallDirection
 
@@ -54,7 +53,7 @@ class TwilioPhoneConversation(AbstractPhoneConversation):  # noqa: F821
             events_manager=events_manager,
         )
         self.twilio_config = twilio_config 
-        self.telephony_client = TwilioClient(
+        self.telephony_client = TwilioClient.for_config(
             base_url=self.base_url, maybe_twilio_config=self.twilio_config
         )
         self.twilio_sid = twilio_sid
@@ -63,8 +62,17 @@ class TwilioPhoneConversation(AbstractPhoneConversation):  # noqa: F821
     async def attach_ws_and_start(self, ws: WebSocket):
         super().attach_ws(ws)
 
-        await self._wait_for_twilio_start(ws)
+        # the streaming provider reads Twilio's start message itself, so the
+        # call is set up while the handshake is still in flight
+        connected_task = asyncio_create_task(self._publish_connected())
+        try:
+            await self.start_until_completed()
+        finally:
+            connected_task.cancel()
+            await self.terminate()
 
+    async def _publish_connected(self):
+        await self.output_device.wait_for_stream()
         self.events_manager.publish_event(
             PhoneCallConnectedEvent(
                 conversation_id=self.conversation_id,
@@ -72,18 +80,3 @@ class TwilioPhoneConversation(AbstractPhoneConversation):  # noqa: F821
                 from_phone_number=self.from_phone,
             )
         )
-
-        await self.start_until_completed()
-        await self.terminate()
-
-    async def _wait_for_twilio_start(self, ws: WebSocket):
-        while True:
-            message = await ws.receive_text()
-            if not message:
-                continue
-            data = json.loads(message)
-            if data["event"] == "start":
-                logger.debug(f"Media WS: Received event '{data['event']}': {message}")
-                self.output_device.set_ws(ws)
-                self.output_device.set_streaming_id(data["start"]["streamSid"])
-                break
\ No newline at end of file
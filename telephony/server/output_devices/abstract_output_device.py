@@ -1,13 +1,234 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Deque, Dict, List, NamedTuple
+
 from fastapi import WebSocket
+from loguru import logger
+
+from telephony.server.output_devices.audio_chunk import AudioChunk, ChunkState
+from telephony.utils.asyncio import asyncio_create_task
+from telephony.utils.latency import LatencyHistogram
+
+# one second of 20ms media messages
+DEFAULT_SEND_QUEUE_SIZE = 50
+# how long a call's end waits for queued messages to go out
+DRAIN_TIMEOUT_SECONDS = 5.0
+
+
+class OverflowPolicy(str, Enum):
+    # drop the oldest queued audio to make room for the new message
+    DROP_OLDEST_AUDIO = "drop_oldest_audio"
+    # drop the new audio message and keep what is queued
+    DROP_NEWEST_AUDIO = "drop_newest_audio"
+    # make the sender wait, pushing backpressure into the pipeline
+    BLOCK = "block"
+
+
+class _QueuedMessage(NamedTuple):
+    data: str
+    is_audio: bool
+    queued_at: float
+
+
+@dataclass
+class OutputDeviceStats:
+    sent: int = 0
+    dropped_audio: int = 0
+    failed: int = 0
+    depth: int = 0
+    max_depth: int = 0
+    send_ms: LatencyHistogram = field(default_factory=LatencyHistogram, repr=False)
+    queued_ms: LatencyHistogram = field(default_factory=LatencyHistogram, repr=False)
+
+    def summary(self) -> Dict:
+        return {
+            "sent": self.sent,
+            "dropped_audio": self.dropped_audio,
+            "failed": self.failed,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "send_ms": self.send_ms.summary(),
+            "queued_ms": self.queued_ms.summary(),
+        }
 
 
 class AbstractOutputDevice:
-    def __init__(self):
+    """
+    Per-call outbound side of the telephony websocket. Messages go through a
+    bounded queue drained by a single writer task, so a slow socket only
+    backs up its own call. Audio is subject to `overflow_policy` once
+    `max_queue_size` messages are waiting; control messages (clear, mark) are
+    never dropped.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST_AUDIO,
+    ):
         self.telephony_stream_id: str | None = None
         self.ws: WebSocket | None = None
+        # monotonic time the telephony websocket was accepted
+        self.connected_at: float | None = None
+        self._stream_started = asyncio.Event()
+        # chunks sent to the telephony provider whose mark hasn't come back
+        self.unplayed_chunks: OrderedDict[str, AudioChunk] = OrderedDict()
+
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.stats = OutputDeviceStats()
+        self._queue: Deque[_QueuedMessage] = deque()
+        self._has_messages = asyncio.Event()
+        self._has_space = asyncio.Event()
+        self._has_space.set()
+        self._writer_task: asyncio.Task | None = None
+        self._closed = False
 
     def set_streaming_id(self, streaming_id):
         self.telephony_stream_id = streaming_id
+        self._stream_started.set()
+
+    async def wait_for_stream(self) -> str:
+        # the call is set up while the telephony provider is still sending its
+        # start message, so audio can only go out once this returns
+        await self._stream_started.wait()
+        assert self.telephony_stream_id is not None
+        return self.telephony_stream_id
 
     def set_ws(self, ws):
         self.ws = ws
+
+    async def send_audio(self, data: str):
+        if self._closed:
+            return
+        if len(self._queue) >= self.max_queue_size:
+            if self.overflow_policy == OverflowPolicy.BLOCK:
+                while len(self._queue) >= self.max_queue_size and not self._closed:
+                    self._has_space.clear()
+                    await self._has_space.wait()
+            elif self.overflow_policy == OverflowPolicy.DROP_NEWEST_AUDIO:
+                self.stats.dropped_audio += 1
+                return
+            else:
+                # if only control messages are queued the audio goes through
+                self._drop_oldest_audio()
+        self._enqueue(_QueuedMessage(data, True, time.monotonic()))
+
+    def send_control(self, data: str):
+        if not self._closed:
+            self._enqueue(_QueuedMessage(data, False, time.monotonic()))
+
+    def clear_audio(self):
+        # queued audio is stale once the bot is interrupted
+        kept = [message for message in self._queue if not message.is_audio]
+        self.stats.dropped_audio += len(self._queue) - len(kept)
+        self._queue = deque(kept)
+        self._update_depth()
+
+    async def drain(self, timeout: float = DRAIN_TIMEOUT_SECONDS) -> bool:
+        # a socket that stopped taking messages gets the device closed, so
+        # the call can still end
+        deadline = time.monotonic() + timeout
+        while self._queue and not self._closed:
+            if time.monotonic() >= deadline:
+                logger.warning(
+                    f"Gave up sending {len(self._queue)} messages to {self.telephony_stream_id}"
+                )
+                await self.stop()
+                return False
+            await asyncio.sleep(0.02)
+        return True
+
+    async def stop(self):
+        if self._closed and self._writer_task is None:
+            return
+        self._closed = True
+        self._has_space.set()
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+        if self.stats.sent:
+            logger.info(
+                f"Output device stats for {self.telephony_stream_id}: {self.stats.summary()}"
+            )
+
+    def _enqueue(self, message: _QueuedMessage):
+        self._queue.append(message)
+        self._update_depth()
+        self._has_messages.set()
+        if self._writer_task is None:
+            self._writer_task = asyncio_create_task(self._run_writer())
+
+    def _drop_oldest_audio(self) -> bool:
+        for index, message in enumerate(self._queue):
+            if message.is_audio:
+                del self._queue[index]
+                self.stats.dropped_audio += 1
+                return True
+        return False
+
+    def _update_depth(self):
+        self.stats.depth = len(self._queue)
+        self.stats.max_depth = max(self.stats.max_depth, self.stats.depth)
+        if self.stats.depth < self.max_queue_size:
+            self._has_space.set()
+
+    async def _run_writer(self):
+        while not self._closed:
+            if not self._queue:
+                self._has_messages.clear()
+                await self._has_messages.wait()
+                continue
+            message = self._queue.popleft()
+            self._update_depth()
+            if self.ws is None:
+                logger.warning("Dropping outbound message, no websocket attached")
+                continue
+
+            started = time.monotonic()
+            self.stats.queued_ms.record((started - message.queued_at) * 1000)
+            try:
+                await self.ws.send_text(message.data)
+            except Exception as e:
+                # the socket is gone, stop queueing for it
+                logger.warning(f"Failed to send to {self.telephony_stream_id}: {e}")
+                self.stats.failed += 1
+                self._closed = True
+                self._queue.clear()
+                self._has_space.set()
+                return
+            self.stats.send_ms.record((time.monotonic() - started) * 1000)
+            self.stats.sent += 1
+
+    def track_chunk(self, chunk: AudioChunk) -> str:
+        self.unplayed_chunks[chunk.mark_name] = chunk
+        return chunk.mark_name
+
+    def on_mark(self, name: str) -> AudioChunk | None:
+        # marks come back in order, so everything queued before this one has
+        # been played as well; unknown names belong to interrupted chunks
+        if name not in self.unplayed_chunks:
+            return None
+        while self.unplayed_chunks:
+            mark_name, chunk = self.unplayed_chunks.popitem(last=False)
+            chunk.state = ChunkState.PLAYED
+            chunk.on_play()
+            if mark_name == name:
+                return chunk
+        return None
+
+    def interrupt(self) -> List[AudioChunk]:
+        self.clear_audio()
+        interrupted = list(self.unplayed_chunks.values())
+        self.unplayed_chunks.clear()
+        for chunk in interrupted:
+            chunk.state = ChunkState.INTERRUPTED
+            chunk.on_interrupt()
+        return interrupted
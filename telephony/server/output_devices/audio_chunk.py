@@ -1,6 +1,7 @@
 import uuid
 from dataclasses import dataclass, field
 from enum import Enum
+from typing import Callable
 from uuid import UUID
 
 
@@ -10,19 +11,23 @@ class ChunkState(int, Enum):
     INTERRUPTED = 2
 
 
+def _noop():
+    pass
+
+
 @dataclass
 class AudioChunk:
     data: bytes
     state: ChunkState = ChunkState.UNPLAYED
     chunk_id: UUID = field(default_factory=uuid.uuid4)
+    # number of outbound frames sent on the call up to the end of this chunk
+    end_frame: int = 0
+    on_play: Callable[[], None] = field(default=_noop, repr=False)
+    on_interrupt: Callable[[], None] = field(default=_noop, repr=False)
 
-    @staticmethod
-    def on_play():
-        pass
-
-    @staticmethod
-    def on_interrupt():
-        pass
+    @property
+    def mark_name(self) -> str:
+        return str(self.chunk_id)
 
     def __hash__(self) -> int:
         return hash(self.chunk_id)
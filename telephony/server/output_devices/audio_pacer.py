@@ -0,0 +1,158 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Iterable, Optional, Union
+
+from loguru import logger
+
+from telephony.constants.constants import (
+    DEFAULT_AUDIO_ENCODING,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_SAMPLING_RATE,
+    MULAW_SILENCE_BYTE,
+)
+from telephony.utils.asyncio import asyncio_create_task
+from telephony.utils.strings import get_chunk_size_per_second
+
+FRAME_DURATION_SECONDS = 0.02
+DEFAULT_FRAME_SIZE = int(
+    get_chunk_size_per_second(DEFAULT_AUDIO_ENCODING, DEFAULT_SAMPLING_RATE)
+    * FRAME_DURATION_SECONDS
+)
+DEFAULT_LEAD_FRAMES = 3
+
+# a raw frame, or a frame that has already been base64 encoded for sending
+PacedFrame = Union[bytes, str]
+
+
+class AudioPacer:
+    """
+    Re-frames outbound audio into fixed 20ms frames and sends them at real-time
+    pace, keeping at most `lead_frames` ahead of playback on the far end.
+    `write` blocks once `DEFAULT_CHUNK_SIZE` bytes are queued, so a long TTS
+    burst is held back in the pipeline instead of in the socket, and
+    `interrupt` drops everything that has not been sent yet.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[PacedFrame], Awaitable[None]],
+        frame_size: int = DEFAULT_FRAME_SIZE,
+        lead_frames: int = DEFAULT_LEAD_FRAMES,
+        max_buffered_bytes: int = DEFAULT_CHUNK_SIZE,
+        silence_byte: bytes = MULAW_SILENCE_BYTE,
+    ):
+        assert max_buffered_bytes % frame_size == 0, "buffer must hold whole frames"
+        self.frame_size = frame_size
+        self.lead_frames = lead_frames
+        self.max_buffered_frames = max_buffered_bytes // frame_size
+        self._send = send
+        self._silence_byte = silence_byte
+
+        self._partial = bytearray()
+        self._frames: Deque[PacedFrame] = deque()
+        self._has_frames = asyncio.Event()
+        self._has_space = asyncio.Event()
+        self._has_space.set()
+        self._task: Optional[asyncio.Task] = None
+        self._interruptions = 0
+
+        self._clock_start = 0.0
+        self._frames_sent = 0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio_create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def wait_until_done(self):
+        self._flush_partial()
+        while self._frames:
+            await asyncio.sleep(FRAME_DURATION_SECONDS)
+
+    @property
+    def buffered_frames(self) -> int:
+        return len(self._frames)
+
+    async def write(self, audio: bytes):
+        self._partial.extend(audio)
+        while len(self._partial) >= self.frame_size:
+            await self._wait_for_space()
+            self._frames.append(bytes(self._partial[: self.frame_size]))
+            del self._partial[: self.frame_size]
+            self._has_frames.set()
+
+    async def write_frames(self, frames: Iterable[PacedFrame]):
+        # queue whole frames prepared ahead of time, e.g. a cached greeting
+        self._flush_partial()
+        interruptions = self._interruptions
+        for frame in frames:
+            await self._wait_for_space()
+            if self._interruptions != interruptions:
+                return
+            self._frames.append(frame)
+            self._has_frames.set()
+
+    async def _wait_for_space(self):
+        while len(self._frames) >= self.max_buffered_frames:
+            self._has_space.clear()
+            await self._has_space.wait()
+
+    def interrupt(self):
+        self._interruptions += 1
+        self._partial.clear()
+        self._frames.clear()
+        self._has_frames.clear()
+        self._has_space.set()
+
+    def _flush_partial(self):
+        # pad the tail of an utterance out to a whole frame
+        if self._partial:
+            padding = self._silence_byte * (self.frame_size - len(self._partial))
+            self._frames.append(bytes(self._partial) + padding)
+            self._partial.clear()
+            self._has_frames.set()
+
+    async def _next_frame(self) -> PacedFrame:
+        while not self._frames:
+            try:
+                await asyncio.wait_for(
+                    self._has_frames.wait(), timeout=FRAME_DURATION_SECONDS
+                )
+            except asyncio.TimeoutError:
+                self._flush_partial()
+
+        # if the far end has drained everything we sent, give it a fresh lead
+        # before pacing again
+        now = time.monotonic()
+        if now > self._clock_start + self._frames_sent * FRAME_DURATION_SECONDS:
+            self._clock_start = now
+            self._frames_sent = 0
+
+        frame = self._frames.popleft()
+        if not self._frames:
+            self._has_frames.clear()
+        self._has_space.set()
+        return frame
+
+    async def _run(self):
+        while True:
+            frame = await self._next_frame()
+            try:
+                await self._send(frame)
+            except Exception as e:
+                logger.warning(f"Failed to send paced audio frame: {e}")
+            self._frames_sent += 1
+
+            ahead = (self._frames_sent - self.lead_frames) * FRAME_DURATION_SECONDS
+            delay = self._clock_start + ahead - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
@@ -1,8 +1,9 @@
+import time
 from typing import Optional
 import typing
 
 import sentry_sdk
-from fastapi import APIRouter, HTTPException, WebSocket
+from fastapi import APIRouter, HTTPException, WebSocket, status
 from loguru import logger
 
 from streaming_providers.base import BaseStreamingProvider
@@ -16,6 +17,7 @@ from telephony.config_manager.base_config_manager import (
     BaseConfigManager,
 )
 from telephony.models.telephony import TwilioCallConfig
+from telephony.server.admission import AdmissionController
 from telephony.server.conversation.abstract_phone_conversation import (
     AbstractPhoneConversation,
 )
@@ -23,6 +25,7 @@ from telephony.server.conversation.twilio_phone_conversation import (
     TwilioPhoneConversation,
 )
 from telephony.server.output_devices.abstract_output_device import AbstractOutputDevice
+from telephony.utils.asyncio import asyncio_create_task
 from telephony.utils.events_manager import EventsManager
 
 
@@ -34,12 +37,14 @@ class CallsRouter:
         streaming_factory: AbstractStreamingProviderFactory,
         # streaming_provider_config: StreamingProviderConfig,
         events_manager: EventsManager | None = None,
+        admission_controller: AdmissionController | None = None,
     ):
         super().__init__()
         self.base_url = base_url
         self.streaming_factory = streaming_factory
         self.config_manager = config_manager
         self.events_manager = events_manager
+        self.admission_controller = admission_controller or AdmissionController()
         # self.streaming_provider_config = streaming_provider_config
 
         self.router = APIRouter()
@@ -73,16 +78,27 @@ class CallsRouter:
             raise ValueError(f"Unknown call config type {call_config.type}")
 
     async def connect_call(self, websocket: WebSocket, id: str):
-        with sentry_sdk.start_transaction(op="connect_call") as sentry_txn:
+        if not self.admission_controller.admit_call(id):
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+            return
+
+        with (
+            sentry_sdk.start_transaction(op="connect_call") as sentry_txn,
+            self.admission_controller.track_call(),
+        ):
             # sentry_transaction.set(sentry_txn)
+            # the config is loaded while the websocket handshake completes
+            config_task = asyncio_create_task(self.config_manager.get_config(id))
             await websocket.accept()
+            connected_at = time.monotonic()
 
             logger.debug("Phone WS connection opened for chat {}".format(id))
-            call_config = await self.config_manager.get_config(id)
+            call_config = await config_task
             if not call_config:
                 raise HTTPException(status_code=400, detail="No active phone call")
 
             device = AbstractOutputDevice()
+            device.connected_at = connected_at
             streaming_provider = self.streaming_factory.create_streaming_provider(
                 websocket=websocket,
                 device=device,  # type: ignore
@@ -90,6 +106,7 @@ class CallsRouter:
                 call_config=call_config,
                 config_manager=self.config_manager,
                 events_manager=self.events_manager,
+                conversation_id=id,
             )
 
             phone_conversation = self._from_call_config(
@@ -1,9 +1,12 @@
 import abc
-from functools import partial
+import asyncio
+import os
 from typing import List, Optional
+from urllib.parse import parse_qsl
 import typing
 
-from fastapi import APIRouter, Form, Request, Response
+from fastapi import APIRouter, Form, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 from loguru import logger
 
 from streaming_providers.default_factory import (
@@ -11,6 +14,10 @@ from streaming_providers.default_factory import (
     DefaultStreamingProviderFactory,
 )
 from streaming_providers.models import StreamingProviderConfig
+from telephony.capacity_registry.base_capacity_registry import (
+    BaseCapacityRegistry,
+    CapacityHeartbeat,
+)
 from telephony.clients.abstract import AbstractTelephonyClient
 from telephony.clients.twilio_client import TwilioClient
 from telephony.config_manager.base_config_manager import (
@@ -20,14 +27,25 @@ from telephony.config_manager.base_config_manager import (
 from telephony.models.events import RecordingEvent
 from telephony.models.model import BaseModel
 from telephony.models.telephony import TwilioCallConfig, TwilioConfig
+from telephony.server.admission import AdmissionController
 from telephony.server.router import CallsRouter
+from telephony.utils.async_requestor import AsyncRequestor
 from telephony.utils.events_manager import EventsManager
+from telephony.utils.redis import RedisClientRegistry
 from telephony.utils.strings import create_conversation_id
 
 
+TWILIO_RINGING_STATUSES = {"queued", "initiated", "ringing"}
+# a call that connected has already taken its warm pipeline
+TWILIO_ENDED_STATUSES = {"completed", "busy", "failed", "no-answer", "canceled"}
+
+
 class AbstractInboundCallConfig(BaseModel, abc.ABC):
     url: str
     streaming_provider_config: StreamingProviderConfig
+    # where callers are sent while the worker is at capacity; rejected as
+    # busy when unset
+    overflow_url: str | None = None
 
 
 class TwilioInboundCallConfig(AbstractInboundCallConfig):
@@ -42,17 +60,42 @@ class TelephonyServer:
         streaming_factory: AbstractStreamingProviderFactory = DefaultStreamingProviderFactory(),
         inbound_call_configs: List[AbstractInboundCallConfig] = [],
         events_manager: Optional[EventsManager] = None,
+        admission_controller: AdmissionController | None = None,
+        capacity_registry: BaseCapacityRegistry | None = None,
+        media_host: str | None = os.getenv("MEDIA_HOST"),
     ):
         self.base_url = base_url
+        self.admission_controller = admission_controller or AdmissionController()
+        # this node's own host, which media streams are pointed at when it is
+        # behind a load balancer
+        self.media_host = media_host or base_url
+        self.capacity_registry = capacity_registry
+        self.capacity_heartbeat: CapacityHeartbeat | None = None
+        if capacity_registry is not None:
+            self.capacity_heartbeat = CapacityHeartbeat(
+                capacity_registry, self.media_host, self.admission_controller
+            )
         self.router = APIRouter()
         self.config_manager = config_manager
         self.events_manager = events_manager
+        self.streaming_factory = streaming_factory
+        self.inbound_call_configs = inbound_call_configs
+        self.router.add_event_handler("startup", self.config_manager.start)
+        self.router.add_event_handler("shutdown", self.config_manager.stop)
+        self.router.add_event_handler("startup", self.warm_up)
+        self.router.add_event_handler("startup", self.admission_controller.start)
+        self.router.add_event_handler("shutdown", self.streaming_factory.close)
+        self.router.add_event_handler("shutdown", self.admission_controller.stop)
+        if self.capacity_heartbeat is not None:
+            self.router.add_event_handler("startup", self.capacity_heartbeat.start)
+            self.router.add_event_handler("shutdown", self.capacity_heartbeat.stop)
         self.router.include_router(
             CallsRouter(
                 base_url=base_url,
                 config_manager=self.config_manager,
                 streaming_factory=streaming_factory,
                 events_manager=self.events_manager,
+                admission_controller=self.admission_controller,
             ).get_router()
         )
         for config in inbound_call_configs:
@@ -62,6 +105,14 @@ class TelephonyServer:
                 methods=["POST"],
             )
         self.router.add_api_route("/events", self.events, methods=["GET", "POST"])
+        self.router.add_api_route("/ready", self.ready, methods=["GET"])
+        self.router.add_api_route("/health/redis", self.redis_health, methods=["GET"])
+        self.router.add_api_route("/metrics/http", self.http_metrics, methods=["GET"])
+        self.router.add_api_route(
+            "/twilio/call_status/{conversation_id}",
+            self.twilio_call_status,
+            methods=["POST"],
+        )
         logger.info(f"Set up events endpoint at https://{self.base_url}/events")
 
         self.router.add_api_route(
@@ -76,9 +127,64 @@ class TelephonyServer:
             f"Set up recordings endpoint at https://{self.base_url}/recordings/{{conversation_id}}"
         )
 
+    async def warm_up(self):
+        await asyncio.gather(
+            *(
+                self.streaming_factory.warm_up(config.streaming_provider_config)
+                for config in self.inbound_call_configs
+            )
+        )
+
     def events(self, request: Request):
         return Response()
 
+    def ready(self):
+        # for the load balancer: stop sending calls while over capacity
+        stats = self.admission_controller.stats
+        reason = self.admission_controller.overloaded()
+        return JSONResponse(
+            {
+                "ready": reason is None,
+                "reason": reason,
+                "active_calls": stats.active_calls,
+                "reserved_calls": stats.reserved_calls,
+                "headroom": self.admission_controller.headroom,
+                "loop_lag_ms": round(stats.loop_lag_ms, 1),
+                "cpu": round(stats.cpu, 3),
+            },
+            status_code=200 if reason is None else 503,
+        )
+
+    async def redis_health(self):
+        registry = RedisClientRegistry()
+        latencies = await registry.probe()
+        healthy = all(latency is not None for latency in latencies.values())
+        return JSONResponse(
+            {"healthy": healthy, "ping_ms": latencies, "pools": registry.stats()},
+            status_code=200 if healthy else 503,
+        )
+
+    def http_metrics(self):
+        # latency and errors of requests to Twilio and the other providers
+        return JSONResponse(AsyncRequestor().stats_summary())
+
+    async def twilio_call_status(
+        self, conversation_id: str, call_status: str = Form(alias="CallStatus")
+    ):
+        # outbound calls report here from the moment they are placed, so the
+        # pipeline can be warmed while the callee's phone rings
+        if call_status in TWILIO_RINGING_STATUSES:
+            call_config = await self.config_manager.get_config(conversation_id)
+            # the config is saved once Twilio has accepted the call, so it may
+            # not be there yet for "initiated"
+            if call_config is not None:
+                self.streaming_factory.warm_call(
+                    conversation_id, call_config.streaming_provider_config
+                )
+        elif call_status in TWILIO_ENDED_STATUSES:
+            self.streaming_factory.evict_call(conversation_id)
+        return Response()
+
     async def get_pilvo_answer_url(self, conversation_id):
         "TODO: Implement Plivo answer URL"
         # xml_response = ""
@@ -99,37 +205,64 @@ class TelephonyServer:
         self,
         inbound_call_config: AbstractInboundCallConfig,
     ):
-        async def twilio_route(
-            twilio_config: TwilioConfig,
-            streaming_provider_config: StreamingProviderConfig,
-            twilio_sid: str = Form(alias="CallSid"),
-            twilio_from: str = Form(alias="From"),
-            twilio_to: str = Form(alias="To"),
-        ) -> Response:
-            call_config = TwilioCallConfig(
-                streaming_provider_config=streaming_provider_config,
-                twilio_config=twilio_config,
-                twilio_sid=twilio_sid,
-                from_phone=twilio_from,
-                to_phone=twilio_to,
-                direction="inbound",
+        if not isinstance(inbound_call_config, TwilioInboundCallConfig):
+            raise ValueError(
+                f"Unknown inbound call config type {type(inbound_call_config)}"
             )
+        # everything but the call's own fields is the same for every call of
+        # the route, so the config is built once and copied per call
+        call_config_template = TwilioCallConfig(
+            streaming_provider_config=inbound_call_config.streaming_provider_config,
+            twilio_config=inbound_call_config.twilio_config,
+            twilio_sid="",
+            from_phone="",
+            to_phone="",
+            direction="inbound",
+        )
+        twilio_client = TwilioClient.for_config(
+            base_url=self.base_url, maybe_twilio_config=inbound_call_config.twilio_config
+        )
+        overflow_url = inbound_call_config.overflow_url
+
+        async def twilio_route(request: Request) -> Response:
+            # Twilio posts a urlencoded form, parsed here without the overhead
+            # of FastAPI's form dependencies
+            form = dict(parse_qsl((await request.body()).decode()))
+            try:
+                call_fields = {
+                    "twilio_sid": form["CallSid"],
+                    "from_phone": form["From"],
+                    "to_phone": form["To"],
+                }
+            except KeyError as e:
+                raise HTTPException(status_code=422, detail=f"Missing form field {e}")
             conversation_id = create_conversation_id("inbound")
-            await self.config_manager.save_config(conversation_id, call_config)
-            twilio_client = TwilioClient(
-                base_url=self.base_url, maybe_twilio_config=twilio_config
+            media_host = await self.pick_media_host()
+            # another node's connect_call does its own admission
+            if media_host is None or (
+                media_host == self.media_host
+                and not self.admission_controller.reserve(conversation_id)
+            ):
+                return twilio_client.get_overflow_twiml(overflow_url)
+            await self.config_manager.save_config(
+                conversation_id, call_config_template.copy(update=call_fields)
             )
-            return twilio_client.get_connection_twiml(conversation_id)
+            return twilio_client.get_connection_twiml(conversation_id, media_host)
 
-        if isinstance(inbound_call_config, TwilioInboundCallConfig):
-            logger.info(
-                f"Set up inbound call TwiML at https://{self.base_url}{inbound_call_config.url}"
-            )
-            return partial(twilio_route, inbound_call_config.twilio_config)
-        else:
-            raise ValueError(
-                f"Unknown inbound call config type {type(inbound_call_config)}"
-            )
+        logger.info(
+            f"Set up inbound call TwiML at https://{self.base_url}{inbound_call_config.url}"
+        )
+        return twilio_route
+
+    async def pick_media_host(self) -> str | None:
+        # None when no node has headroom
+        if self.capacity_registry is None:
+            return self.media_host
+        try:
+            return await self.capacity_registry.pick_host()
+        except Exception as e:
+            logger.warning(f"Failed to read the capacity registry: {e}")
+            return self.media_host
 
     async def end_outbound_call(self, conversation_id: str):
         call_config = await self.config_manager.get_config(conversation_id)
@@ -137,7 +270,7 @@ class TelephonyServer:
             raise ValueError(f"Could not find call config for {conversation_id}")
         telephony_client: AbstractTelephonyClient
         if isinstance(call_config, TwilioCallConfig):
-            telephony_client = TwilioClient(
+            telephony_client = TwilioClient.for_config(
                 base_url=self.base_url, maybe_twilio_config=call_config.twilio_config
             )
             await telephony_client.end_call(call_config.twilio_sid)
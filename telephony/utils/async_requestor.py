@@ -1,29 +1,106 @@
-from typing import Optional
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Optional
 
 import aiohttp
 import httpx
 from aiohttp import BaseConnector
 
+from telephony.utils.latency import LatencyHistogram
 from telephony.utils.singleton import Singleton
 
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "200"))
+# per provider host, e.g. api.twilio.com
+HTTP_POOL_SIZE_PER_HOST = int(os.getenv("HTTP_POOL_SIZE_PER_HOST", "100"))
+# idle connections are kept this long so bursts of calls skip the TLS handshake
+HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "60"))
+DNS_CACHE_SECONDS = 300
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("HTTP_REQUEST_TIMEOUT_SECONDS", "15"))
+CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    # responses that weren't 2xx and requests that failed
+    errors: int = 0
+    timeouts: int = 0
+    # until the response headers arrived
+    latency_ms: LatencyHistogram = field(default_factory=LatencyHistogram, repr=False)
+
+    def summary(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "latency_ms": self.latency_ms.summary(),
+        }
+
 
 class AsyncRequestor(Singleton):
     def __init__(self, connector: Optional[BaseConnector] = None):
-        self.session = aiohttp.ClientSession(connector=connector)
-        self.async_client = httpx.AsyncClient()
         self.connector = connector
+        self.session: aiohttp.ClientSession | None = None
+        self.async_client: httpx.AsyncClient | None = None
+        self.stats: Dict[str, EndpointStats] = {}
 
     def get_session(self):
-        if self.session.closed:
-            self.session = aiohttp.ClientSession(connector=self.connector)
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=self.connector or self._create_connector(),
+                # a connector that was passed in outlives the session
+                connector_owner=self.connector is None,
+                timeout=aiohttp.ClientTimeout(
+                    total=REQUEST_TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS
+                ),
+            )
         return self.session
 
     def get_client(self):
+        if self.async_client is None:
+            self.async_client = httpx.AsyncClient()
         return self.async_client
 
+    @asynccontextmanager
+    async def request(
+        self, endpoint: str, method: str, url: str, **kwargs
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        # `endpoint` names the call in the stats, e.g. "twilio.create_call"
+        stats = self.stats.setdefault(endpoint, EndpointStats())
+        stats.requests += 1
+        started = time.perf_counter()
+        try:
+            async with self.get_session().request(method, url, **kwargs) as response:
+                stats.latency_ms.record((time.perf_counter() - started) * 1000)
+                if not response.ok:
+                    stats.errors += 1
+                yield response
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            raise
+        except aiohttp.ClientError:
+            stats.errors += 1
+            raise
+
+    def stats_summary(self) -> Dict[str, Dict]:
+        return {endpoint: stats.summary() for endpoint, stats in self.stats.items()}
+
     async def close_session(self):
-        if not self.session.closed:
+        if self.session is not None and not self.session.closed:
             await self.session.close()
 
     async def close_client(self):
-        await self.async_client.aclose()
+        if self.async_client is not None:
+            await self.async_client.aclose()
+
+    def _create_connector(self) -> aiohttp.TCPConnector:
+        return aiohttp.TCPConnector(
+            limit=HTTP_POOL_SIZE,
+            limit_per_host=HTTP_POOL_SIZE_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+            use_dns_cache=True,
+            ttl_dns_cache=DNS_CACHE_SECONDS,
+        )
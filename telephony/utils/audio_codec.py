@@ -0,0 +1,145 @@
+from math import gcd
+
+import numpy as np
+
+
+ULAW_BIAS = 0x84
+ULAW_CLIP = 8159
+
+
+def _build_ulaw_decode_table() -> np.ndarray:
+    ulaw = ~np.arange(256, dtype=np.uint8)
+    sign = ulaw & 0x80
+    exponent = ((ulaw >> 4) & 0x07).astype(np.int32)
+    mantissa = (ulaw & 0x0F).astype(np.int32)
+    magnitude = (((mantissa << 3) + ULAW_BIAS) << exponent) - ULAW_BIAS
+    return np.where(sign != 0, -magnitude, magnitude).astype(np.int16)
+
+
+def _build_ulaw_encode_table() -> np.ndarray:
+    # Indexed by the uint16 view of an int16 sample. Bit-exact with
+    # audioop.lin2ulaw, which works on 14-bit magnitudes.
+    samples = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 2
+    mask = np.where(samples < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(samples), ULAW_CLIP) + (ULAW_BIAS >> 2)
+    segment = np.maximum(np.floor(np.log2(magnitude)).astype(np.int32) - 5, 0)
+    ulaw = (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F)
+    ulaw = np.where(segment >= 8, 0x7F, ulaw)
+    return ((ulaw ^ mask) & 0xFF).astype(np.uint8)
+
+
+ULAW_DECODE_TABLE = _build_ulaw_decode_table()
+ULAW_ENCODE_TABLE = _build_ulaw_encode_table()
+
+
+def ulaw_decode(ulaw_bytes: bytes) -> bytes:
+    return ULAW_DECODE_TABLE[np.frombuffer(ulaw_bytes, dtype=np.uint8)].tobytes()
+
+
+def ulaw_encode(pcm_bytes: bytes) -> bytes:
+    samples = np.frombuffer(pcm_bytes, dtype=np.int16).view(np.uint16)
+    return ULAW_ENCODE_TABLE[samples].tobytes()
+
+
+class StreamingResampler:
+    # Polyphase windowed-sinc resampler for 16-bit mono PCM that keeps its
+    # filter history between calls, so a stream can be fed one frame at a time
+    # without clicks at the frame boundaries.
+    def __init__(self, in_rate: int, out_rate: int, taps_per_phase: int = 16):
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        divisor = gcd(in_rate, out_rate)
+        self._up = out_rate // divisor
+        self._down = in_rate // divisor
+
+        num_taps = taps_per_phase * max(self._up, self._down)
+        num_taps += -num_taps % self._up
+        cutoff = 1.0 / max(self._up, self._down)
+        t = np.arange(num_taps) - (num_taps - 1) / 2
+        kernel = cutoff * np.sinc(cutoff * t) * np.kaiser(num_taps, 8.0) * self._up
+
+        # phases[p] holds the taps that apply to output samples landing on
+        # phase p of the upsampled grid, reversed so they line up with an
+        # ascending input window
+        self._taps = num_taps // self._up
+        self._phases = np.ascontiguousarray(
+            kernel.reshape(self._taps, self._up).T[:, ::-1], dtype=np.float32
+        )
+        self._phases_t = np.ascontiguousarray(self._phases.T)
+        self.reset()
+
+    def reset(self):
+        self._history = np.zeros(self._taps - 1, dtype=np.float32)
+        self._position = 0
+
+    def _windows(self, buffer: np.ndarray, start: int, count: int, step: int):
+        # zero-copy view of `count` filter windows starting every `step` samples
+        return np.ndarray(
+            (count, self._taps),
+            dtype=np.float32,
+            buffer=buffer,
+            offset=start * buffer.itemsize,
+            strides=(step * buffer.itemsize, buffer.itemsize),
+        )
+
+    def process(self, pcm_bytes: bytes) -> bytes:
+        if self._up == self._down:
+            return pcm_bytes
+
+        samples = np.frombuffer(pcm_bytes, dtype=np.int16)
+        size = samples.size
+        if size == 0:
+            return b""
+
+        history = self._taps - 1
+        buffer = np.empty(history + size, dtype=np.float32)
+        buffer[:history] = self._history
+        buffer[history:] = samples
+
+        if self._down == 1:
+            # pure interpolation: every input sample yields `up` outputs
+            output = self._windows(buffer, 0, size, 1).dot(self._phases_t).ravel()
+        elif self._up == 1:
+            # pure decimation: one output every `down` input samples
+            count = max(0, -(-(size - self._position) // self._down))
+            windows = self._windows(buffer, self._position, count, self._down)
+            output = windows.dot(self._phases[0])
+            self._position += count * self._down - size
+        else:
+            positions = np.arange(self._position, size * self._up, self._down)
+            windows = self._windows(buffer, 0, size, 1)[positions // self._up]
+            output = np.einsum("nk,nk->n", windows, self._phases[positions % self._up])
+            if positions.size:
+                self._position = int(positions[-1]) + self._down - size * self._up
+            else:
+                self._position -= size * self._up
+
+        self._history = buffer[size:]
+        np.clip(output, -32768, 32767, out=output)
+        return output.astype(np.int16).tobytes()
+
+
+class UlawDecoder:
+    def __init__(self, in_rate: int, out_rate: int):
+        self._resampler = StreamingResampler(in_rate, out_rate)
+
+    def reset(self):
+        self._resampler.reset()
+
+    def decode(self, ulaw_bytes: bytes) -> bytes:
+        return self._resampler.process(ulaw_decode(ulaw_bytes))
+
+
+class UlawEncoder:
+    def __init__(self, in_rate: int, out_rate: int):
+        self._resampler = StreamingResampler(in_rate, out_rate)
+
+    @property
+    def in_rate(self) -> int:
+        return self._resampler.in_rate
+
+    def reset(self):
+        self._resampler.reset()
+
+    def encode(self, pcm_bytes: bytes) -> bytes:
+        return ulaw_encode(self._resampler.process(pcm_bytes))
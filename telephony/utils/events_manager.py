@@ -16,7 +16,9 @@ class EventsManager:
         self.active = False
 
     def publish_event(self, event: Event):
-        if event and event.type in self.subscriptions:
+        # events carry their EventType in `event_type`; `type` is the model tag
+        event_type = getattr(event, "event_type", None)
+        if event and event_type in self.subscriptions:
             self.queue.put_nowait(event)
 
     async def start(self):
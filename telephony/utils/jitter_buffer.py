@@ -0,0 +1,117 @@
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional
+
+from telephony.constants.constants import MULAW_SILENCE_BYTE
+
+DEFAULT_FRAME_DURATION_MS = 20
+DEFAULT_MAX_DEPTH = 10
+# frames released between each step down of the depth added after a late frame
+LATE_BOOST_DECAY_FRAMES = 50
+
+
+@dataclass
+class JitterBufferStats:
+    received: int = 0
+    released: int = 0
+    late: int = 0
+    lost: int = 0
+    reordered: int = 0
+    duplicates: int = 0
+    jitter_ms: float = 0.0
+    depth: int = 0
+
+
+class JitterBuffer:
+    """
+    Reorders inbound media frames by their chunk number and releases them as
+    soon as they are contiguous. A gap is only waited on while fewer than
+    `depth` later frames are buffered; after that it is filled with silence.
+    The depth follows the measured interarrival jitter (RFC 3550), so a clean
+    link runs with no added latency.
+    """
+
+    def __init__(
+        self,
+        frame_duration_ms: int = DEFAULT_FRAME_DURATION_MS,
+        min_depth: int = 0,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        silence_byte: bytes = MULAW_SILENCE_BYTE,
+    ):
+        self.frame_duration_ms = frame_duration_ms
+        self.min_depth = min_depth
+        self.max_depth = max_depth
+        self.stats = JitterBufferStats(depth=min_depth)
+        self._silence_byte = silence_byte
+
+        self._pending: Dict[int, bytes] = {}
+        self._first_chunk: Optional[int] = None
+        self._next_chunk: Optional[int] = None
+        self._highest_chunk: Optional[int] = None
+        self._lost_chunks: Deque[int] = deque(maxlen=max_depth * 4)
+        self._frame_size = 0
+
+        self._last_transit: Optional[float] = None
+        self._late_boost = 0
+        self._released_since_boost = 0
+
+    def push(self, chunk: int, timestamp: int, payload: bytes, arrival_ms: float) -> List[bytes]:
+        stats = self.stats
+        stats.received += 1
+        self._frame_size = len(payload) or self._frame_size
+        self._update_jitter(timestamp, arrival_ms)
+
+        if self._next_chunk is None:
+            self._first_chunk = self._next_chunk = chunk
+
+        if chunk < self._next_chunk or chunk in self._pending:
+            if chunk in self._lost_chunks or chunk < self._first_chunk:
+                # arrived after we gave up on it and played silence instead
+                stats.late += 1
+                self._late_boost = min(self.max_depth, self._late_boost + 1)
+                self._released_since_boost = 0
+            else:
+                stats.duplicates += 1
+            return []
+
+        if self._highest_chunk is not None and chunk < self._highest_chunk:
+            stats.reordered += 1
+        else:
+            self._highest_chunk = chunk
+
+        self._pending[chunk] = payload
+        return self._drain()
+
+    def _update_jitter(self, timestamp: int, arrival_ms: float):
+        transit = arrival_ms - timestamp
+        if self._last_transit is not None:
+            delta = abs(transit - self._last_transit)
+            self.stats.jitter_ms += (delta - self.stats.jitter_ms) / 16
+        self._last_transit = transit
+
+        jitter_frames = math.ceil(2 * self.stats.jitter_ms / self.frame_duration_ms)
+        target = max(jitter_frames, self._late_boost, self.min_depth)
+        self.stats.depth = min(target, self.max_depth)
+
+    def _drain(self) -> List[bytes]:
+        released = []
+        assert self._next_chunk is not None
+        while self._pending:
+            payload = self._pending.pop(self._next_chunk, None)
+            if payload is None:
+                if len(self._pending) <= self.stats.depth:
+                    break
+                payload = self._silence_byte * self._frame_size
+                self._lost_chunks.append(self._next_chunk)
+                self.stats.lost += 1
+            released.append(payload)
+            self._next_chunk += 1
+
+        self.stats.released += len(released)
+        if self._late_boost:
+            self._released_since_boost += len(released)
+            if self._released_since_boost >= LATE_BOOST_DECAY_FRAMES:
+                self._late_boost -= 1
+                self._released_since_boost = 0
+        return released
@@ -0,0 +1,211 @@
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Dict, List
+
+import sentry_sdk
+from loguru import logger
+
+from telephony.models.events import CallLatencyEvent, TurnLatencyEvent
+from telephony.utils.events_manager import EventsManager
+from telephony.utils.singleton import Singleton
+
+# buckets grow by 5%, so a percentile is reported within 5% of the true value
+BUCKET_GROWTH = 1.05
+MAX_LATENCY_MS = 60_000
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyStage(str, Enum):
+    # all measured from the end of the caller's speech
+    STT = "stt"
+    LLM_FIRST_TOKEN = "llm_first_token"
+    TTS_FIRST_BYTE = "tts_first_byte"
+    VOICE_TO_VOICE = "voice_to_voice"
+    # once per call, from accepting the websocket to the first audio sent
+    CALL_SETUP = "call_setup"
+
+
+# the last segment of a turn is the time it takes the first audio to go out
+SPAN_NAMES = {LatencyStage.VOICE_TO_VOICE: "first_media"}
+
+
+class LatencyHistogram:
+    # Log-bucketed histogram: constant memory and O(1) record, so it can sit
+    # on the audio path and be kept for the lifetime of the process.
+    _log_growth = math.log(BUCKET_GROWTH)
+    _num_buckets = int(math.log(MAX_LATENCY_MS) / math.log(BUCKET_GROWTH)) + 2
+
+    def __init__(self):
+        self.counts = [0] * self._num_buckets
+        self.count = 0
+        self.max_ms = 0.0
+
+    def record(self, latency_ms: float):
+        if latency_ms < 1:
+            bucket = 0
+        else:
+            bucket = min(
+                int(math.log(latency_ms) / self._log_growth) + 1, self._num_buckets - 1
+            )
+        self.counts[bucket] += 1
+        self.count += 1
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def percentile(self, percentile: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = math.ceil(self.count * percentile / 100)
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                upper = 1.0 if bucket == 0 else BUCKET_GROWTH**bucket
+                return min(upper, self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> Dict[str, float]:
+        summary = {f"p{p}": round(self.percentile(p), 1) for p in PERCENTILES}
+        summary["count"] = self.count
+        return summary
+
+
+class LatencyHistograms:
+    def __init__(self):
+        self.histograms: Dict[LatencyStage, LatencyHistogram] = {
+            stage: LatencyHistogram() for stage in LatencyStage
+        }
+
+    def record(self, stages_ms: Dict[LatencyStage, float]):
+        for stage, latency_ms in stages_ms.items():
+            self.histograms[stage].record(latency_ms)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            stage.value: histogram.summary()
+            for stage, histogram in self.histograms.items()
+            if histogram.count
+        }
+
+
+class ProcessLatencyStats(LatencyHistograms, Singleton):
+    # process-wide latency histograms across all calls
+    pass
+
+
+@dataclass
+class _Turn:
+    user_stopped: float
+    marks: Dict[LatencyStage, float] = field(default_factory=dict)
+
+
+class CallLatencyTracker:
+    """
+    Tracks voice-to-voice latency for each turn of a call: from the end of the
+    caller's speech to the final transcript, the first LLM token, the first
+    TTS audio and the first media frame sent back to Twilio. Completed turns
+    go into per-call and process-wide histograms, are published as
+    TurnLatencyEvent and recorded as child spans of the current Sentry span.
+    """
+
+    def __init__(
+        self,
+        conversation_id: str,
+        events_manager: EventsManager | None = None,
+        connected_at: float | None = None,
+    ):
+        self.conversation_id = conversation_id
+        self.events_manager = events_manager
+        self.connected_at = connected_at
+        self.histograms = LatencyHistograms()
+        self._sentry_span = sentry_sdk.get_current_span()
+        # converts monotonic marks to wall-clock times for Sentry
+        self._wall_offset = time.time() - time.monotonic()
+        self._turn: _Turn | None = None
+        self._transcribed_early = False
+
+    def user_started_speaking(self):
+        # a turn that hasn't produced audio yet was interrupted
+        self._turn = None
+        self._transcribed_early = False
+
+    def user_stopped_speaking(self):
+        self._turn = _Turn(user_stopped=time.monotonic())
+        if self._transcribed_early:
+            # the final transcript beat the VAD
+            self._turn.marks[LatencyStage.STT] = self._turn.user_stopped
+        self._transcribed_early = False
+
+    def mark(self, stage: LatencyStage):
+        turn = self._turn
+        if turn is None:
+            if stage == LatencyStage.STT:
+                self._transcribed_early = True
+            return
+        if stage not in turn.marks:
+            turn.marks[stage] = time.monotonic()
+            if stage == LatencyStage.VOICE_TO_VOICE:
+                self._complete(turn)
+
+    def mark_first_media(self):
+        if self.connected_at is not None:
+            setup_ms = (time.monotonic() - self.connected_at) * 1000
+            self.connected_at = None
+            logger.debug(f"Call setup for {self.conversation_id} took {setup_ms:.0f}ms")
+            self.histograms.record({LatencyStage.CALL_SETUP: setup_ms})
+            ProcessLatencyStats().record({LatencyStage.CALL_SETUP: setup_ms})
+        if self._turn is not None:
+            self.mark(LatencyStage.VOICE_TO_VOICE)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return self.histograms.summary()
+
+    def finish(self):
+        summary = self.summary()
+        if not summary:
+            return
+        logger.info(f"Latency for {self.conversation_id}: {summary}")
+        if self.events_manager is not None:
+            self.events_manager.publish_event(
+                CallLatencyEvent(conversation_id=self.conversation_id, stages=summary)
+            )
+
+    def _complete(self, turn: _Turn):
+        self._turn = None
+        stages_ms = {
+            stage: max(0.0, (mark - turn.user_stopped) * 1000)
+            for stage, mark in turn.marks.items()
+        }
+        self.histograms.record(stages_ms)
+        ProcessLatencyStats().record(stages_ms)
+
+        if self.events_manager is not None:
+            self.events_manager.publish_event(
+                TurnLatencyEvent(
+                    conversation_id=self.conversation_id,
+                    stages_ms={stage.value: round(ms, 1) for stage, ms in stages_ms.items()},
+                )
+            )
+        self._record_spans(turn)
+
+    def _record_spans(self, turn: _Turn):
+        if self._sentry_span is None:
+            return
+        turn_span = self._sentry_span.start_child(
+            op="voice_to_voice", start_timestamp=self._wall_time(turn.user_stopped)
+        )
+        previous = turn.user_stopped
+        marks: List = sorted(turn.marks.items(), key=lambda item: item[1])
+        for stage, mark in marks:
+            span = turn_span.start_child(
+                op=f"voice_to_voice.{SPAN_NAMES.get(stage, stage.value)}",
+                start_timestamp=self._wall_time(previous),
+            )
+            span.finish(end_timestamp=self._wall_time(mark))
+            previous = mark
+        turn_span.finish(end_timestamp=self._wall_time(previous))
+
+    def _wall_time(self, monotonic: float) -> datetime:
+        return datetime.fromtimestamp(monotonic + self._wall_offset, tz=timezone.utc)
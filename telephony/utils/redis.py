@@ -1,34 +1,251 @@
+import asyncio
 import os
-from redis.asyncio import Redis
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Tuple
+
+from loguru import logger
+from redis.asyncio import BlockingConnectionPool, ConnectionPool, Redis
+from redis.asyncio.client import Pipeline
+from redis.asyncio.connection import Connection, SSLConnection, UnixDomainSocketConnection
 from redis.backoff import ExponentialBackoff, NoBackoff
 from redis.exceptions import ConnectionError, TimeoutError
 from redis.retry import Retry
 
+from telephony.utils.latency import LatencyHistogram
+from telephony.utils.singleton import Singleton
+
+PROBE_TIMEOUT_SECONDS = 1.0
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class RedisSettings:
+    host: str = "localhost"
+    port: int = 6379
+    username: str | None = None
+    password: str | None = None
+    ssl: bool = False
+    # connects over this socket instead of host and port when set
+    unix_socket_path: str | None = None
+    # 3 for RESP3
+    protocol: int = 2
+    # per pool; callers wait up to pool_timeout_seconds for a free connection
+    max_connections: int = 50
+    pool_timeout_seconds: float = 5.0
+
+    @classmethod
+    def from_env(cls) -> "RedisSettings":
+        return cls(
+            host=os.environ.get("REDISHOST", "localhost"),
+            port=int(os.environ.get("REDISPORT", 6379)),
+            username=os.environ.get("REDISUSER", None),
+            password=os.environ.get("REDISPASSWORD", None),
+            ssl=env_bool("REDISSSL"),
+            unix_socket_path=os.environ.get("REDIS_UNIX_SOCKET", None),
+            protocol=int(os.environ.get("REDIS_PROTOCOL", 2)),
+            max_connections=int(os.environ.get("REDIS_MAX_CONNECTIONS", 50)),
+            pool_timeout_seconds=float(os.environ.get("REDIS_POOL_TIMEOUT_SECONDS", 5)),
+        )
+
+
+@dataclass
+class RedisPoolStats:
+    max_connections: int
+    in_use: int = 0
+    max_in_use: int = 0
+    # callers that found every connection in use
+    saturated: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    wait_ms: LatencyHistogram = field(default_factory=LatencyHistogram, repr=False)
+    command_ms: LatencyHistogram = field(default_factory=LatencyHistogram, repr=False)
+    ping_ms: LatencyHistogram = field(default_factory=LatencyHistogram, repr=False)
+
+    def summary(self) -> Dict:
+        return {
+            "max_connections": self.max_connections,
+            "in_use": self.in_use,
+            "max_in_use": self.max_in_use,
+            "saturated": self.saturated,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "wait_ms": self.wait_ms.summary(),
+            "command_ms": self.command_ms.summary(),
+            "ping_ms": self.ping_ms.summary(),
+        }
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    # A released connection is handed straight to the caller that has waited
+    # longest. BlockingConnectionPool wakes a waiter but lets any caller take
+    # the connection first, so under a burst some callers wait until they
+    # time out while newer ones are served.
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = RedisPoolStats(max_connections=self.max_connections)
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def get_connection(self, command_name, *keys, **options):
+        started = time.perf_counter()
+        if self._waiters or not self.can_get_connection():
+            self.stats.saturated += 1
+            connection = await self._wait_for_connection()
+        else:
+            connection = self.get_available_connection()
+        self.stats.wait_ms.record((time.perf_counter() - started) * 1000)
+        self.stats.in_use = len(self._in_use_connections)
+        self.stats.max_in_use = max(self.stats.max_in_use, self.stats.in_use)
+        try:
+            await self.ensure_connection(connection)
+        except BaseException:
+            await self.release(connection)
+            raise
+        return connection
+
+    async def release(self, connection):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(connection)
+                return
+        await ConnectionPool.release(self, connection)
+        self.stats.in_use = len(self._in_use_connections)
+
+    async def _wait_for_connection(self):
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError as e:
+            # failed commands are counted as errors by the client
+            self.stats.timeouts += 1
+            raise ConnectionError("No connection available.") from e
+        except BaseException:
+            # cancelled just after a connection was handed over
+            if waiter.done() and not waiter.cancelled():
+                await self.release(waiter.result())
+            raise
+
+
+class InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True):
+        started = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        except Exception:
+            self.connection_pool.stats.errors += 1
+            raise
+        finally:
+            self.connection_pool.stats.command_ms.record((time.perf_counter() - started) * 1000)
+
+
+class InstrumentedRedis(Redis):
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        except Exception:
+            self.connection_pool.stats.errors += 1
+            raise
+        finally:
+            self.connection_pool.stats.command_ms.record((time.perf_counter() - started) * 1000)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+class RedisClientRegistry(Singleton):
+    """
+    Process-wide Redis clients. Clients with the same settings share one
+    size-limited pool, so Redis connections don't grow with the number of
+    calls and every pool's saturation and command latency is measured.
+    """
+
+    def __init__(self, settings: RedisSettings | None = None):
+        # read when the first client is created, after any .env is loaded
+        self.settings = settings or RedisSettings.from_env()
+        self.pools: Dict[Tuple[bool, int], InstrumentedConnectionPool] = {}
+        self._clients: Dict[Tuple[bool, int], InstrumentedRedis] = {}
+
+    def client(self, retries: int = 1, decode_responses: bool = True) -> Redis:
+        key = (decode_responses, retries)
+        if key not in self._clients:
+            self.pools[key] = self._create_pool(retries, decode_responses)
+            self._clients[key] = InstrumentedRedis(connection_pool=self.pools[key])
+        return self._clients[key]
+
+    def stats(self) -> Dict[str, Dict]:
+        return {self._pool_name(key): pool.stats.summary() for key, pool in self.pools.items()}
+
+    async def probe(self) -> Dict[str, float | None]:
+        # PING latency of each pool in milliseconds, None when it failed
+        keys = list(self._clients)
+        latencies = await asyncio.gather(*(self._ping(key) for key in keys))
+        return {self._pool_name(key): latency for key, latency in zip(keys, latencies)}
+
+    async def close(self):
+        for pool in self.pools.values():
+            await pool.disconnect()
+
+    async def _ping(self, key: Tuple[bool, int]) -> float | None:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._clients[key].ping(), PROBE_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning(f"Redis probe of the {self._pool_name(key)} pool failed: {e}")
+            return None
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.pools[key].stats.ping_ms.record(latency_ms)
+        return round(latency_ms, 2)
+
+    def _pool_name(self, key: Tuple[bool, int]) -> str:
+        decode_responses, retries = key
+        return f"{'str' if decode_responses else 'bytes'}_retries_{retries}"
+
+    def _create_pool(self, retries: int, decode_responses: bool) -> InstrumentedConnectionPool:
+        settings = self.settings
+        backoff = ExponentialBackoff() if retries > 1 else NoBackoff()
+        kwargs = dict(
+            username=settings.username,
+            password=settings.password,
+            db=0,
+            decode_responses=decode_responses,
+            protocol=settings.protocol,
+            retry=Retry(backoff, retries),
+            retry_on_error=[ConnectionError, TimeoutError],
+            health_check_interval=30,
+        )
+        if settings.unix_socket_path:
+            kwargs.update(connection_class=UnixDomainSocketConnection, path=settings.unix_socket_path)
+        elif settings.ssl:
+            kwargs.update(
+                connection_class=SSLConnection,
+                host=settings.host,
+                port=settings.port,
+                ssl_cert_reqs="none",
+            )
+        else:
+            kwargs.update(connection_class=Connection, host=settings.host, port=settings.port)
+        return InstrumentedConnectionPool(
+            max_connections=settings.max_connections,
+            timeout=settings.pool_timeout_seconds,
+            **kwargs,
+        )
+
 
 def initialize_redis_bytes():
-    return Redis(
-        host=os.environ.get("REDISHOST", "localhost"),
-        port=int(os.environ.get("REDISPORT", 6379)),
-        username=os.environ.get("REDISUSER", None),
-        password=os.environ.get("REDISPASSWORD", None),
-        db=0,
-        ssl=bool(os.environ.get("REDISSSL", False)),
-        ssl_cert_reqs="none",
-    )
-
-
-def initialize_redis(retries: int = 1):
-    backoff = ExponentialBackoff() if retries > 1 else NoBackoff()
-    retry = Retry(backoff, retries)
-    return Redis(  # type: ignore
-        host=os.environ.get("REDISHOST", "localhost"),
-        port=int(os.environ.get("REDISPORT", 6379)),
-        username=os.environ.get("REDISUSER", None),
-        password=os.environ.get("REDISPASSWORD", None),
-        decode_responses=True,
-        retry=retry,  # type: ignore
-        ssl=bool(os.environ.get("REDISSSL", False)),
-        ssl_cert_reqs="none",
-        retry_on_error=[ConnectionError, TimeoutError],
-        health_check_interval=30,
-    )
+    return initialize_redis(decode_responses=False)
+
+
+def initialize_redis(retries: int = 1, decode_responses: bool = True):
+    return RedisClientRegistry().client(retries=retries, decode_responses=decode_responses)
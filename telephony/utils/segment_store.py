@@ -0,0 +1,111 @@
+import fcntl
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Tuple
+
+from loguru import logger
+
+DATA_FILE_NAME = "segments.dat"
+INDEX_FILE_NAME = "segments.idx"
+
+
+class SegmentStore:
+    """
+    Append-only on-disk store of byte segments addressed by a string key.
+    Segments are appended to a single data file that is read back through
+    mmap, and each one is recorded in a text index only after its data has
+    been written, so a crash can at worst lose the last segment.
+
+    Processes may share a directory: appends are serialized with an
+    exclusive lock on the data file, and a lookup that misses picks up the
+    index entries other processes appended since.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index: Dict[str, Tuple[int, int]] = {}
+
+        self._data = open(self.directory / DATA_FILE_NAME, "a+b")
+        self._index_file = open(self.directory / INDEX_FILE_NAME, "a")
+        self._index_reader = open(self.directory / INDEX_FILE_NAME, "rb")
+        # how far into the index file entries have been read
+        self._index_position = 0
+        # flock doesn't exclude threads sharing the file
+        self._write_lock = threading.Lock()
+        self._mmap: mmap.mmap | None = None
+        self._read_index()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def size_bytes(self) -> int:
+        return os.fstat(self._data.fileno()).st_size
+
+    def get(self, key: str) -> bytes | None:
+        location = self._index.get(key)
+        if location is None:
+            self._read_index()
+            location = self._index.get(key)
+            if location is None:
+                return None
+        offset, length = location
+        if self._mmap is None or offset + length > len(self._mmap):
+            self._remap()
+        assert self._mmap is not None
+        return self._mmap[offset : offset + length]
+
+    def put(self, key: str, segment: bytes):
+        if key in self._index or not segment:
+            return
+        with self._write_lock:
+            fcntl.flock(self._data.fileno(), fcntl.LOCK_EX)
+            try:
+                self._data.seek(0, os.SEEK_END)
+                offset = self._data.tell()
+                self._data.write(segment)
+                self._data.flush()
+                self._index_file.write(f"{key} {offset} {len(segment)}\n")
+                self._index_file.flush()
+            finally:
+                fcntl.flock(self._data.fileno(), fcntl.LOCK_UN)
+        self._index[key] = (offset, len(segment))
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._data.close()
+        self._index_file.close()
+        self._index_reader.close()
+
+    def _remap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap = mmap.mmap(self._data.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _read_index(self):
+        # entries appended since the last read, by this or another process
+        if os.fstat(self._index_reader.fileno()).st_size <= self._index_position:
+            return
+        data_size = self.size_bytes
+        self._index_reader.seek(self._index_position)
+        for line in self._index_reader:
+            if not line.endswith(b"\n"):
+                # still being written
+                break
+            self._index_position += len(line)
+            try:
+                key, offset, length = line.decode().split()
+                location = (int(offset), int(length))
+            except ValueError:
+                logger.warning(f"Skipping corrupt segment index entry: {line!r}")
+                continue
+            if location[0] + location[1] <= data_size:
+                self._index[key] = location
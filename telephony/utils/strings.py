@@ -1,3 +1,6 @@
+import os
+from typing import Tuple
+
 from cuid2 import Cuid
 
 from telephony.models.audio import AudioEncoding
@@ -15,7 +18,14 @@ def get_chunk_size_per_second(audio_encoding: AudioEncoding, sampling_rate: int)
         raise Exception("Unsupported audio encoding")
 
 
+# creating a generator fingerprints the host, which takes about a
+# millisecond, so each process keeps one
+_cuid_generator: Tuple[int, Cuid] | None = None
+
+
 def create_conversation_id(direction: str):
-    CUID_GENERATOR: Cuid = Cuid(length=15)
+    global _cuid_generator
+    if _cuid_generator is None or _cuid_generator[0] != os.getpid():
+        _cuid_generator = (os.getpid(), Cuid(length=15))
 
-    return f"{direction}_{CUID_GENERATOR.generate()}"
+    return f"{direction}_{_cuid_generator[1].generate()}"
@@ -0,0 +1,73 @@
+import json
+from typing import NamedTuple, Optional
+
+# Twilio always serializes media messages with the same key order and no
+# whitespace, so the fields can be sliced out of the raw text instead of
+# decoding the whole message.
+MEDIA_EVENT_PREFIX = '{"event":"media",'
+
+
+class MediaMessage(NamedTuple):
+    payload: str
+    chunk: Optional[int] = None
+    timestamp: Optional[int] = None
+
+
+CHUNK_KEY = '"chunk":"'
+TIMESTAMP_KEY = '"timestamp":"'
+PAYLOAD_KEY = '"payload":"'
+
+
+def parse_media_message(data: str | bytes) -> Optional[MediaMessage]:
+    if not isinstance(data, str) or not data.startswith(MEDIA_EVENT_PREFIX):
+        return None
+
+    start = data.find(PAYLOAD_KEY)
+    if start == -1:
+        return None
+    start += len(PAYLOAD_KEY)
+    end = data.find('"', start)
+    if end == -1:
+        return None
+    payload = data[start:end]
+
+    chunk = timestamp = None
+    index = data.find(CHUNK_KEY, 0, start)
+    if index != -1:
+        index += len(CHUNK_KEY)
+        chunk = int(data[index : data.find('"', index)])
+    index = data.find(TIMESTAMP_KEY, 0, start)
+    if index != -1:
+        index += len(TIMESTAMP_KEY)
+        timestamp = int(data[index : data.find('"', index)])
+    return MediaMessage(payload, chunk, timestamp)
+
+
+def media_message_from_json(message: dict) -> MediaMessage:
+    media = message["media"]
+    chunk = media.get("chunk")
+    timestamp = media.get("timestamp")
+    return MediaMessage(
+        payload=media["payload"],
+        chunk=int(chunk) if chunk is not None else None,
+        timestamp=int(timestamp) if timestamp is not None else None,
+    )
+
+
+class MediaMessageTemplate:
+    def __init__(self, stream_sid: str):
+        quoted_sid = json.dumps(stream_sid)
+        self._media_prefix = (
+            '{"event":"media","streamSid":' + quoted_sid + ',"media":{"payload":"'
+        )
+        self.clear_message = '{"event":"clear","streamSid":' + quoted_sid + "}"
+        self._mark_prefix = (
+            '{"event":"mark","streamSid":' + quoted_sid + ',"mark":{"name":'
+        )
+
+    def media(self, payload: str) -> str:
+        # base64 never needs escaping, so it can be spliced in as-is
+        return self._media_prefix + payload + '"}}'
+
+    def mark(self, name: str) -> str:
+        return self._mark_prefix + json.dumps(name) + "}}"
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from streaming_providers.pipecat.greeting_cache import (
+    GreetingAudio,
+    GreetingAudioCache,
+    GreetingKey,
+)
+from telephony.utils.singleton import SingletonMeta
+
+KEY = GreetingKey(voice_id="voice", text="Thanks for calling")
+
+
+@pytest.fixture
+def cache():
+    SingletonMeta._instances.pop(GreetingAudioCache, None)
+    cache = GreetingAudioCache(cache_dir=None)
+    yield cache
+    SingletonMeta._instances.pop(GreetingAudioCache, None)
+
+
+def test_cancelled_caller_does_not_strand_others(cache):
+    async def run():
+        synthesis_started = asyncio.Event()
+        release_synthesis = asyncio.Event()
+        loads = 0
+
+        async def load(key, api_key):
+            nonlocal loads
+            loads += 1
+            synthesis_started.set()
+            await release_synthesis.wait()
+            return GreetingAudio.from_ulaw(b"\x00" * 320)
+
+        cache._load = load
+        first = asyncio.create_task(cache.get(KEY, "api-key"))
+        await synthesis_started.wait()
+        second = asyncio.create_task(cache.get(KEY, "api-key"))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        release_synthesis.set()
+
+        greeting = await asyncio.wait_for(second, timeout=1)
+        assert greeting is not None and len(greeting.frames) == 2
+        assert cache.get_cached(KEY) is greeting
+        assert loads == 1
+
+    asyncio.run(run())
+
+
+def test_failed_synthesis_is_shared_and_retried(cache):
+    async def run():
+        loads = 0
+
+        async def load(key, api_key):
+            nonlocal loads
+            loads += 1
+            await asyncio.sleep(0)
+            raise RuntimeError("synthesis failed")
+
+        cache._load = load
+        results = await asyncio.gather(*(cache.get(KEY, "api-key") for _ in range(3)))
+        assert results == [None, None, None]
+        assert loads == 1
+
+        assert await cache.get(KEY, "api-key") is None
+        assert loads == 2
+
+    asyncio.run(run())
@@ -0,0 +1,37 @@
+import multiprocessing
+
+from telephony.utils.segment_store import SegmentStore
+
+KEYS_PER_WRITER = 2000
+
+
+def segment(writer: int, i: int) -> bytes:
+    return f"{writer}:{i}:".encode() * (1 + i % 7)
+
+
+def write_segments(directory: str, writer: int):
+    store = SegmentStore(directory)
+    for i in range(KEYS_PER_WRITER):
+        store.put(f"{writer}-{i}", segment(writer, i))
+    store.close()
+
+
+def test_processes_sharing_a_directory(tmp_path):
+    reader = SegmentStore(tmp_path)
+    writers = [
+        multiprocessing.Process(target=write_segments, args=(str(tmp_path), writer))
+        for writer in range(2)
+    ]
+    for process in writers:
+        process.start()
+    for process in writers:
+        process.join()
+        assert process.exitcode == 0
+
+    # entries appended after the reader opened the store are found on a miss
+    for store in (reader, SegmentStore(tmp_path)):
+        for writer in range(2):
+            for i in range(KEYS_PER_WRITER):
+                assert store.get(f"{writer}-{i}") == segment(writer, i)
+        assert len(store) == 2 * KEYS_PER_WRITER
+        store.close()